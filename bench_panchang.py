@@ -0,0 +1,272 @@
+# bench_panchang.py
+# Benchmarks for the panchang hot paths, with JSON results and a regression gate.
+#
+#   python bench_panchang.py                                  # run, write bench_results.json
+#   python bench_panchang.py --save-baseline                  # ...and store it as the baseline
+#   python bench_panchang.py --baseline bench_baseline.json --threshold 0.25
+#   python bench_panchang.py --filter house --quick
+#
+# Everything runs offline: the geocoder is replaced by a stub that knows a few
+# fixed places. Scenarios:
+#   single  one call, timed over many repetitions (median per call)
+#   batch   one call over a realistic batch of inputs (median per batch)
+#   cold    first call with empty caches (fresh timezone resolver; for the full
+#           fetch, a fresh interpreter including imports)
+#   warm    the same call again with caches populated
+# With --baseline, the exit status is 1 if any benchmark's median is more than
+# --threshold (fraction) slower than the baseline's. Timings are machine-specific,
+# so record the baseline on the machine that runs the comparison. --quick runs
+# take too few samples for that, so the gate is skipped with --quick.
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytz
+import swisseph as swe  # pyswisseph
+from astral import Observer
+from astral.sun import sunrise
+
+import panchang_core
+from geocoder import Place, set_geocoder, suggest_locations
+from tz_resolver import TimezoneResolver, get_timezone_resolver
+
+DEFAULT_RESULTS_PATH = "bench_results.json"
+DEFAULT_BASELINE_PATH = "bench_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # 25% slower than baseline fails
+
+# ----------------------------
+# Offline geocoder
+# ----------------------------
+STUB_PLACES = [
+    Place(13.0827, 80.2707, "Chennai, Tamil Nadu, India"),
+    Place(19.0760, 72.8777, "Mumbai, Maharashtra, India"),
+    Place(28.6139, 77.2090, "New Delhi, Delhi, India"),
+    Place(51.5072, -0.1276, "London, England, United Kingdom"),
+    Place(40.7128, -74.0060, "New York, New York, United States"),
+    Place(-33.8688, 151.2093, "Sydney, New South Wales, Australia"),
+    Place(64.1466, -21.9426, "Reykjavik, Iceland"),
+]
+
+class StubGeocoder:
+    # same interface as the real backends, answered from STUB_PLACES
+    def suggest(self, query, country_hint=None, limit=6):
+        q = query.strip().lower()
+        return [p for p in STUB_PLACES if p.address.lower().startswith(q)][:limit]
+
+# ----------------------------
+# Timing
+# ----------------------------
+def _autorange(fn, min_time=0.05):
+    # calls per repeat so that one repeat takes at least min_time
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_time or number >= 1_000_000:
+            return number
+        number *= 4
+
+def time_calls(fn, repeat=7, number=None):
+    """Per-call seconds for each of `repeat` runs of `number` calls."""
+    fn()  # warm-up
+    number = number or _autorange(fn)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return samples, number
+
+def time_cold(make_fn, repeat=5):
+    # make_fn() resets state and returns the call to time; each sample is one first call
+    samples = []
+    for _ in range(repeat):
+        fn = make_fn()
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples, 1
+
+_COLD_FETCH_CHILD = """
+import time, datetime
+t0 = time.perf_counter()
+import panchang_core
+from geocoder import Place
+panchang_core.fetch_sunrise_and_positions(Place(13.0827, 80.2707, "Chennai"), datetime.date(2025, 1, 14))
+print(time.perf_counter() - t0)
+"""
+
+def time_cold_process(repeat=3):
+    # imports + first fetch in a fresh interpreter (interpreter start-up itself excluded)
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _COLD_FETCH_CHILD], cwd=here,
+                             capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples, 1
+
+# ----------------------------
+# Benchmarks
+# ----------------------------
+def _inputs(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    longs = rng.uniform(0.0, 360.0, n).tolist()
+    ascs = rng.uniform(0.0, 360.0, n).tolist()
+    start = datetime.date(2025, 1, 1)
+    dates = [start + datetime.timedelta(days=int(d)) for d in rng.integers(0, 3650, n)]
+    return longs, ascs, dates
+
+def benchmarks(quick=False):
+    """name -> (scenario, timing thunk returning (samples, calls per sample))."""
+    repeat = 3 if quick else 7
+    n_batch = 100 if quick else 1000
+    longs, ascs, dates = _inputs(n_batch)
+    chennai = suggest_locations("Chennai", limit=1)[0]
+    places = [suggest_locations(p.address.split(",")[0], limit=1)[0] for p in STUB_PLACES]
+    tz = pytz.timezone("Asia/Kolkata")
+    dt_local = datetime.datetime(2025, 1, 14, 6, 32, 10)
+    jd = panchang_core.datetime_to_julday_utc(dt_local, tz)
+    observer = Observer(chennai.latitude, chennai.longitude)
+    resolver = get_timezone_resolver()
+    swe.set_ephe_path('.')
+    fetch = panchang_core.fetch_sunrise_and_positions
+    fetch_pairs = [(places[i % len(places)], dates[i]) for i in range(min(n_batch, 200))]
+    lat_lons = [(p.latitude + dy, p.longitude + dx) for p in places for dy in (-0.3, 0.0, 0.3) for dx in (-0.3, 0.0, 0.3)]
+
+    def fresh_resolver_lookup():
+        r = TimezoneResolver()
+        return lambda: r.timezone_name(chennai.latitude, chennai.longitude)
+
+    def fresh_resolver_fetch():
+        resolver.clear()
+        return lambda: fetch(chennai, dates[0])
+
+    b = {
+        # single calls
+        "datetime_to_julday_utc": ("single", lambda: time_calls(lambda: panchang_core.datetime_to_julday_utc(dt_local, tz), repeat)),
+        "norm": ("single", lambda: time_calls(lambda: panchang_core.norm(-123.456), repeat)),
+        "deg_to_sign": ("single", lambda: time_calls(lambda: panchang_core.deg_to_sign(283.7), repeat)),
+        "calc_nakshatra_and_pada": ("single", lambda: time_calls(lambda: panchang_core.calc_nakshatra_and_pada(283.7), repeat)),
+        "compute_house": ("single", lambda: time_calls(lambda: panchang_core.compute_house(283.7, 41.2), repeat)),
+        "swe_houses_placidus": ("single", lambda: time_calls(lambda: swe.houses(jd, chennai.latitude, chennai.longitude, b'P'), repeat)),
+        "swe_calc_ut_moon": ("single", lambda: time_calls(lambda: swe.calc_ut(jd, swe.MOON), repeat)),
+        "astral_sunrise": ("single", lambda: time_calls(lambda: sunrise(observer, date=dates[0], tzinfo=tz), repeat)),
+        "tz_lookup": ("warm", lambda: time_calls(lambda: resolver.timezone(chennai.latitude, chennai.longitude), repeat)),
+        "fetch_sunrise_and_positions": ("warm", lambda: time_calls(lambda: fetch(chennai, dates[0]), repeat)),
+        # batches
+        "batch_norm_sign_nakshatra_house": ("batch", lambda: time_calls(lambda: [
+            (panchang_core.deg_to_sign(panchang_core.norm(x)), panchang_core.calc_nakshatra_and_pada(panchang_core.norm(x)),
+             panchang_core.compute_house(x, a)) for x, a in zip(longs, ascs)], repeat, 1)),
+        "batch_tz_lookup": ("batch", lambda: time_calls(lambda: [resolver.timezone_name(lat, lon) for lat, lon in lat_lons], repeat, 1)),
+        "batch_fetch_sunrise_and_positions": ("batch", lambda: time_calls(lambda: [fetch(p, d) for p, d in fetch_pairs], repeat, 1)),
+        # cold starts
+        "tz_lookup_cold": ("cold", lambda: time_cold(fresh_resolver_lookup, 2 if quick else 3)),
+        "fetch_sunrise_and_positions_cold_cache": ("cold", lambda: time_cold(fresh_resolver_fetch, repeat)),
+        "fetch_sunrise_and_positions_cold_process": ("cold", lambda: time_cold_process(1 if quick else 3)),
+    }
+    return b
+
+def run(names=None, quick=False, log=sys.stderr):
+    results = {}
+    for name, (scenario, thunk) in benchmarks(quick).items():
+        if names and not any(n in name for n in names):
+            continue
+        samples, number = thunk()
+        results[name] = {
+            "scenario": scenario,
+            "median_s": statistics.median(samples),
+            "min_s": min(samples),
+            "max_s": max(samples),
+            "repeat": len(samples),
+            "calls_per_sample": number,
+        }
+        if log:
+            print(f"{name:<42} {scenario:<6} {_fmt(results[name]['median_s']):>10}  (min {_fmt(min(samples))})", file=log)
+    return results
+
+def _fmt(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def _metadata():
+    import astral, timezonefinder
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "swisseph": getattr(swe, "__version__", swe.version),
+        "astral": getattr(astral, "__version__", "?"),
+        "timezonefinder": getattr(timezonefinder, "__version__", "?"),
+        "numpy": np.__version__,
+    }
+
+# ----------------------------
+# Baseline comparison
+# ----------------------------
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """-> list of (name, baseline median, current median, ratio) that regressed."""
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = res["median_s"] / base["median_s"] if base["median_s"] > 0 else float("inf")
+        if ratio > 1.0 + threshold:
+            regressions.append((name, base["median_s"], res["median_s"], ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Panchang hot-path benchmarks")
+    parser.add_argument("--output", default=DEFAULT_RESULTS_PATH, help="where to write the JSON results")
+    parser.add_argument("--baseline", default=None, help=f"baseline JSON to compare against (e.g. {DEFAULT_BASELINE_PATH})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown vs. the baseline, as a fraction (default 0.25)")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE_PATH, default=None,
+                        help="also store the results as the baseline")
+    parser.add_argument("--filter", nargs="+", default=None, help="only benchmarks whose name contains one of these")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and smaller batches")
+    args = parser.parse_args(argv)
+
+    set_geocoder(StubGeocoder())
+    results = run(args.filter, args.quick)
+    report = {"meta": _metadata(), "quick": args.quick, "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}", file=sys.stderr)
+
+    if not args.baseline:
+        return 0
+    if args.quick:
+        print("--quick timings are too noisy for a regression gate; comparison skipped", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("quick"):
+        print("warning: the baseline was recorded with --quick; batch sizes are not comparable", file=sys.stderr)
+    regressions = compare(results, baseline, args.threshold)
+    for name, base, cur, ratio in regressions:
+        print(f"REGRESSION {name}: {_fmt(base)} -> {_fmt(cur)} ({ratio:.2f}x, threshold {1.0 + args.threshold:.2f}x)",
+              file=sys.stderr)
+    if not regressions:
+        print(f"No regressions vs. {args.baseline} (threshold {args.threshold:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
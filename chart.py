@@ -0,0 +1,285 @@
+# chart.py
+# Compact chart for the nine grahas: Sun, Moon, Mars, Mercury, Jupiter, Venus,
+# Saturn, Rahu and Ketu, plus the ascendant, tropical or sidereal.
+#
+# A Chart is a __slots__ object holding one float64 vector (23 numbers, see
+# _FIELDS); signs, nakshatras, houses and names are derived on access, and the
+# nested dict / JSON form is built only by to_dict() / to_json(). ChartBatch keeps
+# many charts as struct-of-arrays columns (one array per field), which is what the
+# batch pipeline should hold when it has millions of charts.
+#
+# Each chart is one ephemeris pass: the seven planets and the lunar node once each
+# (tropical, with speeds) and the ascendant from one houses call. A sidereal zodiac
+# is the tropical one minus the ayanamsa of the chosen mode, so switching ayanamsa
+# never recomputes positions. compute_charts(..., use_cache=True) takes the planet
+# positions from the Chebyshev ephemeris cache instead: much faster, but only
+# within ephemeris_cache.TOLERANCE_DEG (5") of swisseph -- a few arc-seconds, so
+# sign/nakshatra edges and retrograde flags near stations can differ from
+# compute_chart for the same instant.
+#
+# Binary forms (little-endian):
+#   Chart       MAGIC b"PCH1", ayanamsa id (u8), node id (u8), 2 pad bytes, 23 x f64  = 192 bytes
+#   ChartBatch  MAGIC b"PCHB", ayanamsa id (u8), node id (u8), 2 pad bytes, count (u64),
+#               then each column of _FIELDS in order (count x f64; count x 9 x f64 for
+#               the per-graha columns)
+import json
+import struct
+import numpy as np
+import swisseph as swe  # pyswisseph
+
+from panchang_core import ZODIAC, NAKSHATRA, datetime_to_julday_utc
+from panchang_batch import norm_vec, deg_to_sign_vec, calc_nakshatra_and_pada_vec, compute_house_vec
+from ephemeris_cache import get_ephemeris_cache
+
+GRAHAS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+_BODIES = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN]
+RAHU, KETU = 7, 8
+_CACHE_NAMES = ["SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN", "RAHU", "KETU"]
+
+NODES = {"mean": swe.MEAN_NODE, "true": swe.TRUE_NODE}
+# name -> swisseph sidereal mode (None = tropical). Ids in the binary form are list positions.
+AYANAMSAS = {
+    "tropical": None,
+    "lahiri": swe.SIDM_LAHIRI,
+    "raman": swe.SIDM_RAMAN,
+    "krishnamurti": swe.SIDM_KRISHNAMURTI,
+    "fagan_bradley": swe.SIDM_FAGAN_BRADLEY,
+    "yukteshwar": swe.SIDM_YUKTESHWAR,
+    "true_citra": swe.SIDM_TRUE_CITRA,
+}
+_AYANAMSA_IDS = list(AYANAMSAS)
+_NODE_IDS = list(NODES)
+
+# layout of the per-chart vector
+_FIELDS = ["jd_ut", "latitude", "longitude", "ayanamsa_deg", "ascendant"]
+N_GRAHAS = len(GRAHAS)
+_LONG = slice(len(_FIELDS), len(_FIELDS) + N_GRAHAS)
+_SPEED = slice(len(_FIELDS) + N_GRAHAS, len(_FIELDS) + 2 * N_GRAHAS)
+VECTOR_SIZE = len(_FIELDS) + 2 * N_GRAHAS
+
+_CHART_HEADER = struct.Struct("<4sBBxx")
+_BATCH_HEADER = struct.Struct("<4sBBxxQ")
+CHART_MAGIC = b"PCH1"
+BATCH_MAGIC = b"PCHB"
+CHART_BYTES = _CHART_HEADER.size + VECTOR_SIZE * 8
+
+# ----------------------------
+# Ephemeris pass
+# ----------------------------
+def _ayanamsa(jd_ut, ayanamsa):
+    # swisseph's sidereal mode is global; it is put back to the library default
+    # (Fagan/Bradley) afterwards, as nothing else here sets one
+    mode = AYANAMSAS[ayanamsa]
+    if mode is None:
+        return 0.0
+    swe.set_sid_mode(mode)
+    try:
+        return swe.get_ayanamsa_ex_ut(jd_ut, 0)[1]  # same value FLG_SIDEREAL subtracts
+    finally:
+        swe.set_sid_mode(swe.SIDM_FAGAN_BRADLEY)
+
+def _fill(vec, jd_ut, lat, lon, ayanamsa, node, tropical=None):
+    # writes one chart into a length-VECTOR_SIZE float64 vector; `tropical` is an
+    # optional precomputed (longitudes, speeds) pair for the nine grahas
+    ayan = _ayanamsa(jd_ut, ayanamsa)
+    if tropical is None:
+        for i, body in enumerate(_BODIES + [NODES[node]]):
+            xx = swe.calc_ut(jd_ut, body, swe.FLG_SPEED)[0]
+            vec[_LONG.start + i] = xx[0]
+            vec[_SPEED.start + i] = xx[3]
+        vec[_LONG.start + KETU] = vec[_LONG.start + RAHU] + 180.0
+        vec[_SPEED.start + KETU] = vec[_SPEED.start + RAHU]
+    else:
+        vec[_LONG], vec[_SPEED] = tropical
+    vec[_LONG] -= ayan
+    try:
+        asc = swe.houses(jd_ut, lat, lon, b'P')[1][0]
+    except swe.Error:
+        asc = swe.houses(jd_ut, lat, lon, b'E')[1][0]  # polar circles: the ascendant is system-independent
+    vec[:len(_FIELDS)] = (jd_ut, lat, lon, ayan, asc - ayan)
+    vec[_LONG] = norm_vec(vec[_LONG])
+    vec[4] = norm_vec(vec[4])
+
+def _check_options(ayanamsa, node):
+    if ayanamsa not in AYANAMSAS:
+        raise ValueError(f"Unknown ayanamsa {ayanamsa!r}; choose from {', '.join(AYANAMSAS)}")
+    if node not in NODES:
+        raise ValueError(f"node must be one of {', '.join(NODES)}")
+
+def compute_chart(lat, lon, when, ayanamsa="tropical", node="mean", tz=None):
+    """Chart at `when` (julian day UT, or a datetime; naive ones are local to `tz`)."""
+    _check_options(ayanamsa, node)
+    if isinstance(when, (int, float)):
+        jd_ut = when
+    elif when.tzinfo is None and tz is None:
+        raise ValueError("naive datetime requires tz")
+    else:
+        jd_ut = datetime_to_julday_utc(when, tz or when.tzinfo)
+    vec = np.empty(VECTOR_SIZE)
+    _fill(vec, float(jd_ut), lat, lon, ayanamsa, node)
+    return Chart(vec, ayanamsa, node)
+
+def compute_charts(lats, lons, jds, ayanamsa="tropical", node="mean", use_cache=False):
+    """ChartBatch for equal-length (or broadcastable) arrays of places and julian days.
+
+    By default positions come from swisseph, exactly as compute_chart. With
+    use_cache=True they come from the Chebyshev ephemeris cache (mean node only,
+    see ephemeris_cache.py), accurate to its TOLERANCE_DEG; ValueError if no
+    cache is installed or it does not cover the instants.
+    """
+    _check_options(ayanamsa, node)
+    lats, lons, jds = (a.ravel() for a in np.broadcast_arrays(
+        np.asarray(lats, float), np.asarray(lons, float), np.asarray(jds, float)))
+    data = np.empty((lats.size, VECTOR_SIZE))
+    if use_cache:
+        cache = get_ephemeris_cache()
+        if node != "mean":
+            raise ValueError("the ephemeris cache only holds the mean node")
+        if cache is None or not cache.covers(jds) or not set(_CACHE_NAMES) <= set(cache.bodies):
+            raise ValueError("no ephemeris cache covering these instants (see PANCHANG_EPHEMERIS_CACHE)")
+        longs = np.stack([cache.longitude(name, jds) for name in _CACHE_NAMES], axis=1)
+        speeds = np.stack([cache.speed(name, jds) for name in _CACHE_NAMES], axis=1)
+        for i in range(lats.size):
+            _fill(data[i], float(jds[i]), float(lats[i]), float(lons[i]), ayanamsa, node, (longs[i], speeds[i]))
+    else:
+        for i in range(lats.size):
+            _fill(data[i], float(jds[i]), float(lats[i]), float(lons[i]), ayanamsa, node)
+    return ChartBatch.from_rows(data, ayanamsa, node)
+
+# ----------------------------
+# Derived values (shared by Chart and ChartBatch)
+# ----------------------------
+def _derived(longs, asc):
+    sign_no, deg_in_sign = deg_to_sign_vec(longs)
+    nak_no, pada, deg_into_nak = calc_nakshatra_and_pada_vec(longs)
+    house, deg_in_house = compute_house_vec(longs, asc)
+    return {"sign_no": sign_no, "deg_in_sign": deg_in_sign, "nakshatra_no": nak_no, "pada": pada,
+            "deg_into_nak": deg_into_nak, "house": house, "deg_in_house": deg_in_house}
+
+class Chart:
+    __slots__ = ("_v", "ayanamsa", "node")
+
+    def __init__(self, vector, ayanamsa="tropical", node="mean"):
+        self._v = vector
+        self.ayanamsa = ayanamsa
+        self.node = node
+
+    jd_ut = property(lambda self: float(self._v[0]))
+    latitude = property(lambda self: float(self._v[1]))
+    longitude = property(lambda self: float(self._v[2]))
+    ayanamsa_deg = property(lambda self: float(self._v[3]))
+    ascendant = property(lambda self: float(self._v[4]))
+    longitudes = property(lambda self: self._v[_LONG])
+    speeds = property(lambda self: self._v[_SPEED])
+
+    def graha(self, name):
+        """Longitude of one graha by name."""
+        return float(self._v[_LONG.start + GRAHAS.index(name)])
+
+    def retrograde(self):
+        # the nodes are always retrograde in mean motion; reported as computed
+        return self.speeds < 0.0
+
+    def derived(self):
+        """Per-graha arrays: sign_no, deg_in_sign, nakshatra_no, pada, deg_into_nak, house, deg_in_house."""
+        return _derived(self.longitudes, np.full(N_GRAHAS, self.ascendant))
+
+    def to_dict(self):
+        d = self.derived()
+        asc_sign_no, asc_deg_in_sign = deg_to_sign_vec(np.array([self.ascendant]))
+        retro = self.retrograde()
+        return {
+            "jd_ut": self.jd_ut, "latitude": self.latitude, "longitude": self.longitude,
+            "ayanamsa": self.ayanamsa, "ayanamsa_deg": self.ayanamsa_deg, "node": self.node,
+            "ascendant_deg": self.ascendant,
+            "ascendant": {"sign": ZODIAC[asc_sign_no[0] - 1], "sign_no": int(asc_sign_no[0]),
+                          "deg_in_sign": float(asc_deg_in_sign[0])},
+            "grahas": {
+                name: {
+                    "ecliptic_long": float(self.longitudes[i]), "speed": float(self.speeds[i]),
+                    "retrograde": bool(retro[i]),
+                    "sign": ZODIAC[d["sign_no"][i] - 1], "sign_no": int(d["sign_no"][i]),
+                    "deg_in_sign": float(d["deg_in_sign"][i]),
+                    "nakshatra": NAKSHATRA[d["nakshatra_no"][i] - 1], "nakshatra_no": int(d["nakshatra_no"][i]),
+                    "pada": int(d["pada"][i]), "deg_into_nak": float(d["deg_into_nak"][i]),
+                    "house": int(d["house"][i]), "deg_in_house": float(d["deg_in_house"][i]),
+                }
+                for i, name in enumerate(GRAHAS)
+            },
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_bytes(self):
+        header = _CHART_HEADER.pack(CHART_MAGIC, _AYANAMSA_IDS.index(self.ayanamsa), _NODE_IDS.index(self.node))
+        return header + self._v.astype("<f8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, ayanamsa_id, node_id = _CHART_HEADER.unpack_from(data)
+        if magic != CHART_MAGIC:
+            raise ValueError("not a chart record")
+        vec = np.frombuffer(data, dtype="<f8", count=VECTOR_SIZE, offset=_CHART_HEADER.size).copy()
+        return cls(vec, _AYANAMSA_IDS[ayanamsa_id], _NODE_IDS[node_id])
+
+    def __eq__(self, other):
+        return (isinstance(other, Chart) and self.ayanamsa == other.ayanamsa and self.node == other.node
+                and np.array_equal(self._v, other._v))
+
+    def __repr__(self):
+        return f"Chart(jd_ut={self.jd_ut:.6f}, lat={self.latitude}, lon={self.longitude}, ayanamsa={self.ayanamsa!r})"
+
+class ChartBatch:
+    """Many charts of one ayanamsa/node as struct-of-arrays columns."""
+
+    __slots__ = ("jd_ut", "latitude", "longitude", "ayanamsa_deg", "ascendant", "longitudes", "speeds",
+                 "ayanamsa", "node")
+
+    def __init__(self, columns, ayanamsa="tropical", node="mean"):
+        for name in _FIELDS + ["longitudes", "speeds"]:
+            setattr(self, name, columns[name])
+        self.ayanamsa = ayanamsa
+        self.node = node
+
+    @classmethod
+    def from_rows(cls, data, ayanamsa="tropical", node="mean"):
+        columns = {name: np.ascontiguousarray(data[:, i]) for i, name in enumerate(_FIELDS)}
+        columns["longitudes"] = np.ascontiguousarray(data[:, _LONG])
+        columns["speeds"] = np.ascontiguousarray(data[:, _SPEED])
+        return cls(columns, ayanamsa, node)
+
+    def __len__(self):
+        return len(self.jd_ut)
+
+    def __getitem__(self, i):
+        vec = np.concatenate([[getattr(self, name)[i] for name in _FIELDS], self.longitudes[i], self.speeds[i]])
+        return Chart(vec, self.ayanamsa, self.node)
+
+    def derived(self):
+        """Per-graha (n, 9) arrays, as Chart.derived()."""
+        return _derived(self.longitudes, np.repeat(self.ascendant[:, None], N_GRAHAS, axis=1))
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in _FIELDS + ["longitudes", "speeds"])
+
+    def to_bytes(self):
+        header = _BATCH_HEADER.pack(BATCH_MAGIC, _AYANAMSA_IDS.index(self.ayanamsa),
+                                    _NODE_IDS.index(self.node), len(self))
+        return header + b"".join(getattr(self, name).astype("<f8").tobytes() for name in _FIELDS + ["longitudes", "speeds"])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Columns are read-only views into `data` (no copy)."""
+        magic, ayanamsa_id, node_id, count = _BATCH_HEADER.unpack_from(data)
+        if magic != BATCH_MAGIC:
+            raise ValueError("not a chart batch")
+        columns = {}
+        offset = _BATCH_HEADER.size
+        for name in _FIELDS + ["longitudes", "speeds"]:
+            width = N_GRAHAS if name in ("longitudes", "speeds") else 1
+            arr = np.frombuffer(data, dtype="<f8", count=count * width, offset=offset)
+            columns[name] = arr.reshape(count, N_GRAHAS) if width > 1 else arr
+            offset += count * width * 8
+        return cls(columns, _AYANAMSA_IDS[ayanamsa_id], _NODE_IDS[node_id])
@@ -0,0 +1,242 @@
+# ephemeris_cache.py
+# Optional precomputed ephemeris: piecewise Chebyshev fits of the geocentric
+# ecliptic longitude of the nine grahas, stored in one compact binary file that is
+# memory-mapped at startup and evaluated with vectorized lookups.
+#
+# Build once (a few seconds per body and century):
+#   python ephemeris_cache.py build ephemeris.cheb --start 1900 --end 2100
+# Verify against swisseph at random instants (exit status 1 if out of tolerance):
+#   python ephemeris_cache.py verify ephemeris.cheb
+# The batch engine picks the file up from PANCHANG_EPHEMERIS_CACHE (default
+# ./ephemeris.cheb) when it exists. Because it is a read-only np.memmap, every
+# process on the host shares the same page-cache pages.
+#
+# Accuracy: every segment is checked against swisseph at CHECK_POINTS_PER_GAP
+# points in every gap between fit nodes (and at both ends) while building, and the
+# build fails if any error exceeds TOLERANCE_DEG. The worst error at those points
+# is stored per body in the file header; it is a dense sample, not a strict bound,
+# so `verify` at other instants can come out somewhat higher (still checked
+# against TOLERANCE_DEG, see tests/test_ephemeris_cache.py).
+import argparse
+import json
+import os
+import struct
+import sys
+import threading
+import numpy as np
+import swisseph as swe  # pyswisseph
+
+MAGIC = b"PCHEB001"
+# 5 arc-seconds. The fits themselves are far tighter; what remains is swisseph's
+# own small kinks (up to ~3" for the outer planets with the built-in Moshier
+# ephemeris), which a smooth polynomial cannot follow.
+TOLERANCE_DEG = 5.0 / 3600.0
+CHECK_POINTS_PER_GAP = 4
+
+# name -> (swisseph body, segment length in days, Chebyshev degree)
+# Ketu is not stored: it is always Rahu + 180.
+BODIES = {
+    "SUN": (swe.SUN, 32.0, 12),
+    "MOON": (swe.MOON, 4.0, 14),
+    "MERCURY": (swe.MERCURY, 8.0, 14),
+    "VENUS": (swe.VENUS, 16.0, 14),
+    "MARS": (swe.MARS, 16.0, 12),
+    "JUPITER": (swe.JUPITER, 32.0, 12),
+    "SATURN": (swe.SATURN, 32.0, 12),
+    "RAHU": (swe.MEAN_NODE, 32.0, 10),
+}
+
+DEFAULT_CACHE_PATH = "ephemeris.cheb"
+
+# ----------------------------
+# Fitting
+# ----------------------------
+def _cheb_nodes(degree):
+    # Chebyshev points of the first kind on [-1, 1], in increasing order
+    k = np.arange(degree + 1)
+    return np.sort(np.cos(np.pi * (k + 0.5) / (degree + 1)))
+
+def _check_points(nodes, per_gap=CHECK_POINTS_PER_GAP):
+    # evenly spread inside every gap of [-1, node_0, ..., node_n, 1], plus both ends
+    edges = np.concatenate([[-1.0], nodes, [1.0]])
+    fractions = (np.arange(per_gap) + 0.5) / per_gap
+    inside = edges[:-1, None] + np.diff(edges)[:, None] * fractions
+    return np.concatenate([[-1.0], inside.ravel(), [1.0]])
+
+def _swe_longitudes(body, jds, flags):
+    return np.array([swe.calc_ut(float(jd), body, flags)[0][0] for jd in jds])
+
+def fit_body(body, jd_start, jd_end, seg_days, degree, flags=0):
+    """Chebyshev coefficients (n_segments, degree + 1) and the worst check error in degrees."""
+    n_segments = int(np.ceil((jd_end - jd_start) / seg_days))
+    nodes = _cheb_nodes(degree)
+    check_x = _check_points(nodes)
+    coeffs = np.empty((n_segments, degree + 1))
+    worst = 0.0
+    for seg in range(n_segments):
+        t0 = jd_start + seg * seg_days
+        mid, half = t0 + seg_days / 2.0, seg_days / 2.0
+        values = np.unwrap(_swe_longitudes(body, mid + half * nodes, flags), period=360.0)
+        coeffs[seg] = np.polynomial.chebyshev.chebfit(nodes, values, degree)
+        fitted = np.polynomial.chebyshev.chebval(check_x, coeffs[seg])
+        actual = _swe_longitudes(body, mid + half * check_x, flags)
+        worst = max(worst, float(np.max(np.abs((fitted - actual + 180.0) % 360.0 - 180.0))))
+    return coeffs, worst
+
+def build_cache(path, start_year=1900, end_year=2100, bodies=None, flags=0, tolerance=TOLERANCE_DEG, log=None):
+    """Fit every body over [start_year-01-01, end_year-12-31] and write the binary file."""
+    swe.set_ephe_path('.')
+    jd_start = swe.julday(start_year, 1, 1, 0.0)
+    jd_end = swe.julday(end_year + 1, 1, 1, 0.0)
+    header = {"jd_start": jd_start, "jd_end": jd_end, "flags": flags, "bodies": {}}
+    blobs = []
+    offset = 0
+    for name in bodies or BODIES:
+        body, seg_days, degree = BODIES[name]
+        coeffs, worst = fit_body(body, jd_start, jd_end, seg_days, degree, flags)
+        if worst > tolerance:
+            raise ValueError(f"{name}: fit error {worst * 3600:.4f}\" exceeds {tolerance * 3600:.4f}\"")
+        if log:
+            print(f"{name}: {coeffs.shape[0]} segments, max error {worst * 3600:.5f}\"", file=log)
+        header["bodies"][name] = {
+            "seg_days": seg_days, "degree": degree, "n_segments": coeffs.shape[0],
+            "offset": offset, "max_error_deg": worst,
+        }
+        blobs.append(coeffs.astype("<f8").tobytes())
+        offset += coeffs.size * 8
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    # coefficient block starts 8-byte aligned so it can be viewed as float64 in place
+    pad = (-(len(MAGIC) + 8 + len(header_bytes))) % 8
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes) + pad))
+        f.write(header_bytes + b" " * pad)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return header
+
+# ----------------------------
+# Lookup
+# ----------------------------
+def _clenshaw(coeffs, x):
+    # sum_k coeffs[:, k] * T_k(x), vectorized over rows (one instant per row)
+    b1 = np.zeros_like(x)
+    b2 = np.zeros_like(x)
+    for k in range(coeffs.shape[1] - 1, 0, -1):
+        b1, b2 = 2.0 * x * b1 - b2 + coeffs[:, k], b1
+    return x * b1 - b2 + coeffs[:, 0]
+
+class EphemerisCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an ephemeris cache file")
+            (header_len,) = struct.unpack("<Q", f.read(8))
+            self.header = json.loads(f.read(header_len).decode("utf-8"))
+        data_offset = len(MAGIC) + 8 + header_len
+        self._data = np.memmap(path, dtype="<f8", mode="r", offset=data_offset)
+        self.jd_start = self.header["jd_start"]
+        self.jd_end = self.header["jd_end"]
+        self.flags = self.header["flags"]
+        self._tables = {}
+        for name, info in self.header["bodies"].items():
+            start = info["offset"] // 8
+            n = info["n_segments"] * (info["degree"] + 1)
+            self._tables[name] = (self._data[start:start + n].reshape(info["n_segments"], info["degree"] + 1), info["seg_days"])
+
+    @property
+    def bodies(self):
+        names = list(self._tables)
+        return names + ["KETU"] if "RAHU" in names else names
+
+    def covers(self, jd):
+        jd = np.asarray(jd, dtype=float)
+        jd = jd[~np.isnan(jd)]
+        return jd.size == 0 or (jd.min() >= self.jd_start and jd.max() < self.jd_end)
+
+    def _segments(self, name, jd):
+        table, seg_days = self._tables[name]
+        rel = (np.asarray(jd, dtype=float) - self.jd_start) / seg_days
+        if np.any((rel < 0) | (rel >= table.shape[0])):
+            raise ValueError(f"JD outside the cached span {self.jd_start}..{self.jd_end}")
+        seg = rel.astype(np.int64)
+        x = 2.0 * (rel - seg) - 1.0
+        return table[seg], x, seg_days
+
+    def longitude(self, name, jd):
+        """Ecliptic longitude (0..360) of `name` at julian day(s) UT `jd`; NaN stays NaN."""
+        if name == "KETU":
+            return (self.longitude("RAHU", jd) + 180.0) % 360.0
+        jd = np.asarray(jd, dtype=float)
+        out = np.full(jd.shape, np.nan)
+        ok = ~np.isnan(jd)
+        coeffs, x, _ = self._segments(name, jd[ok])
+        out[ok] = _clenshaw(coeffs, x) % 360.0
+        return out
+
+    def speed(self, name, jd):
+        """Daily motion in degrees/day, from the derivative of the fit."""
+        if name == "KETU":
+            name = "RAHU"
+        jd = np.asarray(jd, dtype=float)
+        out = np.full(jd.shape, np.nan)
+        ok = ~np.isnan(jd)
+        coeffs, x, seg_days = self._segments(name, jd[ok])
+        deriv = np.polynomial.chebyshev.chebder(coeffs, axis=1)
+        out[ok] = _clenshaw(deriv, x) * 2.0 / seg_days
+        return out
+
+    def verify(self, n_samples=2000, seed=0):
+        """Max |cache - swisseph| in degrees per body at random instants."""
+        rng = np.random.default_rng(seed)
+        jds = rng.uniform(self.jd_start, self.jd_end, n_samples)
+        errors = {}
+        for name in self._tables:
+            body = BODIES[name][0]
+            actual = _swe_longitudes(body, jds, self.flags)
+            diff = (self.longitude(name, jds) - actual + 180.0) % 360.0 - 180.0
+            errors[name] = float(np.max(np.abs(diff)))
+        return errors
+
+_cache = None
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+def get_ephemeris_cache():
+    # the process-wide cache from PANCHANG_EPHEMERIS_CACHE, or None if there is no file
+    global _cache, _cache_loaded
+    if not _cache_loaded:
+        with _cache_lock:
+            if not _cache_loaded:
+                path = os.environ.get("PANCHANG_EPHEMERIS_CACHE", DEFAULT_CACHE_PATH)
+                _cache = EphemerisCache(path) if os.path.exists(path) else None
+                _cache_loaded = True
+    return _cache
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chebyshev ephemeris cache for the grahas")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="fit and write the cache file")
+    build.add_argument("path", nargs="?", default=DEFAULT_CACHE_PATH)
+    build.add_argument("--start", type=int, default=1900, help="first year")
+    build.add_argument("--end", type=int, default=2100, help="last year")
+    build.add_argument("--bodies", nargs="+", choices=list(BODIES), default=None)
+    verify = sub.add_parser("verify", help="compare the cache against swisseph")
+    verify.add_argument("path", nargs="?", default=DEFAULT_CACHE_PATH)
+    verify.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_cache(args.path, args.start, args.end, args.bodies, log=sys.stderr)
+        return 0
+    cache = EphemerisCache(args.path)
+    errors = cache.verify(args.samples)
+    for name, err in errors.items():
+        print(f"{name}: max error {err * 3600:.5f}\" (at build-time check points {cache.header['bodies'][name]['max_error_deg'] * 3600:.5f}\")")
+    return 0 if max(errors.values()) <= TOLERANCE_DEG else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+# geocoder.py
+# Pluggable place lookup for the Streamlit apps.
+#
+# The default backend is a local gazetteer: a GeoNames-style dump (e.g. cities500.txt
+# or cities15000.txt from https://download.geonames.org/export/dump/) loaded once into
+# a read-only SQLite file with a normalized-name prefix index. Lookups are a single
+# B-tree range scan (or a precomputed top-k row for 1-2 character prefixes), so
+# suggestions come back in well under 5 ms with no network.
+# Nominatim stays available as an optional fallback.
+#
+# Build the database once:
+#   python geocoder.py build cities15000.txt gazetteer.sqlite --admin1 admin1CodesASCII.txt
+# and point the apps at it with PANCHANG_GAZETTEER=gazetteer.sqlite (the default path
+# is ./gazetteer.sqlite). Set PANCHANG_GEOCODER_FALLBACK=0 to never touch the network;
+# lookups then fail with an error if the database is missing.
+import argparse
+import csv
+import heapq
+import os
+import sqlite3
+import sys
+import threading
+import unicodedata
+
+import timing
+
+# Same country choices as the UI dropdown in panchang.py / streamlit-run-sunrise_finder.py
+COUNTRY_MAP = {
+    "India":"IN","United States":"US","United Kingdom":"GB","Canada":"CA",
+    "Australia":"AU","Singapore":"SG","UAE":"AE","Germany":"DE","France":"FR"
+}
+COUNTRY_NAMES = {code: name for name, code in COUNTRY_MAP.items()}
+
+DEFAULT_GAZETTEER_PATH = "gazetteer.sqlite"
+
+# Prefixes this short match too many names for a range scan to stay fast, so the
+# build step precomputes their most populous places (a shallow top-k trie).
+SHORT_PREFIX_LEN = 2
+SHORT_PREFIX_TOP_K = 20
+
+# ----------------------------
+# Result objects
+# ----------------------------
+class Place:
+    # Same .latitude/.longitude/.address/.raw interface as geopy's Location,
+    # so the UI and fetch_sunrise_and_positions can use either interchangeably.
+    __slots__ = ("latitude", "longitude", "address", "raw")
+
+    def __init__(self, latitude, longitude, address, raw=None):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.address = address
+        self.raw = raw or {}
+
+    def __repr__(self):
+        return f"Place({self.address!r}, {self.latitude}, {self.longitude})"
+
+# ----------------------------
+# Name normalization
+# ----------------------------
+def normalize_name(text):
+    # "São Paulo" / "Sao  paulo." -> "sao paulo": strip accents, casefold, drop punctuation
+    decomposed = unicodedata.normalize("NFKD", text)
+    chars = []
+    for ch in decomposed:
+        if unicodedata.combining(ch):
+            continue
+        chars.append(ch if ch.isalnum() else " ")
+    return " ".join("".join(chars).casefold().split())
+
+def _prefix_upper_bound(prefix):
+    # smallest string greater than every string starting with `prefix`
+    return prefix + "\U0010ffff"
+
+# ----------------------------
+# Backends
+# ----------------------------
+class GazetteerGeocoder:
+    """Offline prefix search over a SQLite gazetteer built by build_gazetteer()."""
+
+    def __init__(self, db_path=DEFAULT_GAZETTEER_PATH, mmap_size=256 * 1024 * 1024):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Gazetteer database not found: {db_path}")
+        self.db_path = db_path
+        self.mmap_size = mmap_size
+        self._local = threading.local()  # Streamlit runs sessions on different threads
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = f"file:{os.path.abspath(self.db_path)}?mode=ro&immutable=1"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            # let SQLite read the pages through a shared memory map instead of read() copies
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.conn = conn
+        return conn
+
+    def suggest(self, query, country_hint=None, limit=6):
+        # only the first comma-separated part is matched ("Chennai, Tamil Nadu" -> "chennai")
+        prefix = normalize_name(query.split(",")[0])
+        if not prefix:
+            return []
+        country_code = COUNTRY_MAP.get(country_hint)
+        if len(prefix) <= SHORT_PREFIX_LEN:
+            rows = self._conn().execute(
+                "SELECT p.name, p.admin1, p.country, p.lat, p.lon, p.population, p.timezone, p.id "
+                "FROM short_prefix s JOIN places p ON p.id = s.place_id "
+                "WHERE s.prefix = ? AND s.country = ? ORDER BY s.rank LIMIT ?",
+                (prefix, country_code or "", limit),
+            ).fetchall()
+            return [self._to_place(row) for row in rows]
+        sql = (
+            "SELECT p.name, p.admin1, p.country, p.lat, p.lon, p.population, p.timezone, p.id "
+            "FROM names n JOIN places p ON p.id = n.place_id "
+            "WHERE n.norm >= ? AND n.norm < ?"
+        )
+        params = [prefix, _prefix_upper_bound(prefix)]
+        if country_code:
+            sql += " AND n.country = ?"
+            params.append(country_code)
+        # one place can match through several (alternate) names; keep it once, as an
+        # exact match if any of its names equals the query
+        sql += " GROUP BY p.id ORDER BY MAX(n.norm = ?) DESC, p.population DESC LIMIT ?"
+        params += [prefix, limit]
+        rows = self._conn().execute(sql, params).fetchall()
+        return [self._to_place(row) for row in rows]
+
+    @staticmethod
+    def _to_place(row):
+        name, admin1, country, lat, lon, population, timezone, place_id = row
+        parts = [name, admin1, COUNTRY_NAMES.get(country, country)]
+        address = ", ".join(p for p in parts if p)
+        raw = {"geonameid": place_id, "country_code": country, "population": population, "timezone": timezone}
+        return Place(lat, lon, address, raw)
+
+class NominatimGeocoder:
+    """Live OpenStreetMap Nominatim lookup (network, rate-limited)."""
+
+    def __init__(self, user_agent="hora_gui", timeout=10):
+        from geopy.geocoders import Nominatim  # only needed when the fallback is used
+        self._geolocator = Nominatim(user_agent=user_agent, timeout=timeout)
+
+    def suggest(self, query, country_hint=None, limit=6):
+        country_code = COUNTRY_MAP.get(country_hint, None)
+        q = f"{query}, {country_hint}" if country_hint and country_hint != "Other" else query
+        locations = self._geolocator.geocode(q, exactly_one=False, limit=limit, addressdetails=True, country_codes=country_code)
+        return locations or []
+
+class FallbackGeocoder:
+    """Try each backend in turn and return the first non-empty result."""
+
+    def __init__(self, *backends):
+        self.backends = [b for b in backends if b is not None]
+
+    def suggest(self, query, country_hint=None, limit=6):
+        last_error = None
+        for backend in self.backends:
+            try:
+                with timing.stage(f"geocode.{type(backend).__name__}"):
+                    results = backend.suggest(query, country_hint, limit)
+            except Exception as e:
+                last_error = e
+                continue
+            if results:
+                return results
+        if last_error is not None:
+            raise last_error
+        return []
+
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+def get_geocoder():
+    # process-wide backend, chosen once from the environment
+    global _geocoder
+    if _geocoder is None:
+        with _geocoder_lock:
+            if _geocoder is None:
+                _geocoder = _make_default_geocoder()
+    return _geocoder
+
+def set_geocoder(geocoder):
+    # override the backend (e.g. a stub for offline runs)
+    global _geocoder
+    _geocoder = geocoder
+
+def _make_default_geocoder():
+    db_path = os.environ.get("PANCHANG_GAZETTEER", DEFAULT_GAZETTEER_PATH)
+    use_fallback = os.environ.get("PANCHANG_GEOCODER_FALLBACK", "1") != "0"
+    gazetteer = GazetteerGeocoder(db_path) if os.path.exists(db_path) else None
+    if gazetteer is None and not use_fallback:
+        raise RuntimeError(f"No gazetteer database at {db_path} and PANCHANG_GEOCODER_FALLBACK=0 "
+                           "(build one with `python geocoder.py build ...`)")
+    return FallbackGeocoder(gazetteer, NominatimGeocoder() if use_fallback else None)
+
+def suggest_locations(query, country_hint=None, limit=6):
+    # raises on backend errors; callers decide how to report them
+    with timing.stage("geocode"):
+        return get_geocoder().suggest(query, country_hint, limit)
+
+# ----------------------------
+# Building the gazetteer
+# ----------------------------
+# GeoNames "geoname" table columns (tab separated, no header)
+_GN_ID, _GN_NAME, _GN_ASCII, _GN_ALT, _GN_LAT, _GN_LON = 0, 1, 2, 3, 4, 5
+_GN_FCLASS, _GN_COUNTRY, _GN_ADMIN1, _GN_POP, _GN_TZ = 6, 8, 10, 14, 17
+
+def _load_admin1(path):
+    # admin1CodesASCII.txt: "IN.25<TAB>Tamil Nadu<TAB>Tamil Nadu<TAB>1255053"
+    names = {}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if len(row) >= 2:
+                    names[row[0]] = row[1]
+    return names
+
+def build_gazetteer(dump_path, db_path, admin1_path=None, feature_classes=("P",), with_alternate_names=True):
+    """Load a GeoNames dump into a SQLite gazetteer with a prefix index on normalized names."""
+    admin1_names = _load_admin1(admin1_path)
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript("""
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE places (
+            id INTEGER PRIMARY KEY, name TEXT, admin1 TEXT, country TEXT,
+            lat REAL, lon REAL, population INTEGER, timezone TEXT
+        );
+        CREATE TABLE names (norm TEXT, country TEXT, place_id INTEGER);
+    """)
+    n_places = 0
+    with open(dump_path, encoding="utf-8") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) < 18 or (feature_classes and row[_GN_FCLASS] not in feature_classes):
+                continue
+            place_id = int(row[_GN_ID])
+            country = row[_GN_COUNTRY]
+            admin1 = admin1_names.get(f"{country}.{row[_GN_ADMIN1]}", "")
+            conn.execute(
+                "INSERT INTO places VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (place_id, row[_GN_NAME], admin1, country, float(row[_GN_LAT]), float(row[_GN_LON]),
+                 int(row[_GN_POP] or 0), row[_GN_TZ]),
+            )
+            names = {row[_GN_NAME], row[_GN_ASCII]}
+            if with_alternate_names and row[_GN_ALT]:
+                names.update(row[_GN_ALT].split(","))
+            norms = {normalize_name(n) for n in names}
+            norms.discard("")
+            conn.executemany("INSERT INTO names VALUES (?, ?, ?)", [(n, country, place_id) for n in norms])
+            n_places += 1
+    _build_short_prefixes(conn)
+    # built after the bulk insert; (country, norm) serves the country-filtered prefix scan
+    conn.executescript("""
+        CREATE INDEX names_norm ON names (norm);
+        CREATE INDEX names_country_norm ON names (country, norm);
+        CREATE INDEX short_prefix_lookup ON short_prefix (prefix, country, rank);
+        ANALYZE;
+    """)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    os.replace(tmp_path, db_path)
+    return n_places
+
+def _build_short_prefixes(conn):
+    # top-k most populous places for every 1..SHORT_PREFIX_LEN character prefix,
+    # both per country and across all countries (country = "")
+    conn.execute("CREATE TABLE short_prefix (prefix TEXT, country TEXT, rank INTEGER, place_id INTEGER)")
+    buckets = {}
+    rows = conn.execute(
+        "SELECT DISTINCT n.norm, n.country, p.id, p.population FROM names n JOIN places p ON p.id = n.place_id"
+    )
+    for norm, country, place_id, population in rows:
+        for length in range(1, min(SHORT_PREFIX_LEN, len(norm)) + 1):
+            for key in ((norm[:length], country), (norm[:length], "")):
+                bucket = buckets.setdefault(key, {})
+                bucket[place_id] = population
+    for (prefix, country), bucket in buckets.items():
+        top = heapq.nlargest(SHORT_PREFIX_TOP_K, bucket.items(), key=lambda item: item[1])
+        conn.executemany(
+            "INSERT INTO short_prefix VALUES (?, ?, ?, ?)",
+            [(prefix, country, rank, place_id) for rank, (place_id, _) in enumerate(top)],
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline gazetteer for the panchang apps")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="load a GeoNames dump into a SQLite gazetteer")
+    build.add_argument("dump", help="GeoNames dump, e.g. cities15000.txt")
+    build.add_argument("db", nargs="?", default=DEFAULT_GAZETTEER_PATH)
+    build.add_argument("--admin1", help="admin1CodesASCII.txt for state/province names")
+    build.add_argument("--no-alternate-names", action="store_true")
+    search = sub.add_parser("search", help="query an existing gazetteer")
+    search.add_argument("query")
+    search.add_argument("--country")
+    search.add_argument("--db", default=DEFAULT_GAZETTEER_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        n = build_gazetteer(args.dump, args.db, args.admin1, with_alternate_names=not args.no_alternate_names)
+        print(f"Loaded {n} places into {args.db}")
+    else:
+        for place in GazetteerGeocoder(args.db).suggest(args.query, args.country):
+            print(f"{place.address}\t{place.latitude}\t{place.longitude}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
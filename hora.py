@@ -0,0 +1,151 @@
+# hora.py
+# Planetary hours (hora) and choghadiya tables for one location over a range of days.
+#
+# Both split the day (sunrise -> sunset) and the night (sunset -> next sunrise)
+# into equal parts: 12 horas or 8 choghadiyas each. The first hora of the day
+# belongs to the weekday's lord and the rest follow the Chaldean order; the
+# choghadiyas start from the weekday lord's (day) or from the lord of the fifth
+# weekday counting from it (night).
+#
+# Sun events come from panchang_core.fetch_sun_events (the same astral + timezone
+# path as fetch_sunrise_and_positions) through a per-(location, date) cache, so
+# day N's "next sunrise" is day N+1's sunrise, computed once. Rows are generated
+# lazily, one day at a time, so any span can be streamed. Days without a sunrise or
+# sunset (polar day/night) have no rows.
+#
+#   python hora.py --lat 13.0827 --lon 80.2707 --start 2025-01-14 --end 2025-01-14
+#   python hora.py --lat 13.0827 --lon 80.2707 --start 2025-01-01 --end 2025-12-31 --choghadiya --csv > chog.csv
+import argparse
+import csv
+import datetime
+import sys
+from collections import namedtuple
+
+import panchang_core
+from geocoder import Place
+from result_cache import TTLCache
+
+# Chaldean order; each hora's lord is the next one in this list
+CHALDEAN = ["Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon"]
+# date.weekday() (Monday = 0) -> lord of the day
+WEEKDAY_LORD = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
+
+# choghadiya in its day order, starting from the Sun's; (name, lord, nature)
+CHOGHADIYA = [
+    ("Udveg", "Sun", "bad"), ("Chal", "Venus", "neutral"), ("Labh", "Mercury", "good"),
+    ("Amrit", "Moon", "good"), ("Kaal", "Saturn", "bad"), ("Shubh", "Jupiter", "good"),
+    ("Rog", "Mars", "bad"),
+]
+_CHOGHADIYA_OF_LORD = {lord: i for i, (_, lord, _) in enumerate(CHOGHADIYA)}
+NIGHT_STEP = -2  # night choghadiyas skip one: Shubh, Amrit, Chal, Rog, ...
+
+SUN_CACHE_SIZE = 4096
+SUN_CACHE_TTL = 7 * 86400.0
+
+# `number` is 1-based within its period ("day" or "night")
+Hora = namedtuple("Hora", ["date", "period", "number", "lord", "start", "end"])
+Choghadiya = namedtuple("Choghadiya", ["date", "period", "number", "name", "lord", "nature", "start", "end"])
+
+class SunEventCache:
+    """(sunrise, sunset) per (location, date), shared by consecutive days and tables."""
+
+    def __init__(self, max_entries=SUN_CACHE_SIZE, ttl=SUN_CACHE_TTL):
+        self._cache = TTLCache(max_entries, ttl)
+        self.computed = 0
+
+    def get(self, location_obj, date_obj):
+        # -> (sunrise, sunset), or None if the sun does not rise and set that day
+        key = (round(location_obj.latitude, 6), round(location_obj.longitude, 6), date_obj.isoformat())
+        entry = self._cache.get(key)
+        if entry is None:
+            self.computed += 1
+            try:
+                entry = (panchang_core.fetch_sun_events(location_obj, date_obj),)
+            except panchang_core.PanchangError:
+                entry = (None,)  # deterministic, so worth remembering too
+            self._cache.put(key, entry)
+        return entry[0]
+
+    def day(self, location_obj, date_obj):
+        # -> (sunrise, sunset, next sunrise), or None
+        today = self.get(location_obj, date_obj)
+        tomorrow = self.get(location_obj, date_obj + datetime.timedelta(days=1))
+        if today is None or tomorrow is None:
+            return None
+        return today[0], today[1], tomorrow[0]
+
+_sun_events = SunEventCache()
+
+def get_sun_event_cache():
+    return _sun_events
+
+def _split(start, end, parts):
+    step = (end - start) / parts
+    return [(start + i * step, start + (i + 1) * step) for i in range(parts)]
+
+def _days(start_date, end_date):
+    day = start_date
+    while day <= end_date:
+        yield day
+        day += datetime.timedelta(days=1)
+
+def iter_horas(location_obj, start_date, end_date, sun_events=None):
+    """Yield Hora rows for every day in [start_date, end_date], lazily."""
+    sun_events = sun_events or _sun_events
+    for date_obj in _days(start_date, end_date):
+        events = sun_events.day(location_obj, date_obj)
+        if events is None:
+            continue
+        rise, set_, next_rise = events
+        lord_idx = CHALDEAN.index(WEEKDAY_LORD[date_obj.weekday()])
+        for period, (a, b) in (("day", (rise, set_)), ("night", (set_, next_rise))):
+            for number, (start, end) in enumerate(_split(a, b, 12), 1):
+                yield Hora(date_obj, period, number, CHALDEAN[lord_idx % 7], start, end)
+                lord_idx += 1
+
+def iter_choghadiyas(location_obj, start_date, end_date, sun_events=None):
+    """Yield Choghadiya rows for every day in [start_date, end_date], lazily."""
+    sun_events = sun_events or _sun_events
+    for date_obj in _days(start_date, end_date):
+        events = sun_events.day(location_obj, date_obj)
+        if events is None:
+            continue
+        rise, set_, next_rise = events
+        weekday = date_obj.weekday()
+        day_first = _CHOGHADIYA_OF_LORD[WEEKDAY_LORD[weekday]]
+        night_first = _CHOGHADIYA_OF_LORD[WEEKDAY_LORD[(weekday + 4) % 7]]
+        for period, (a, b), first, step in (("day", (rise, set_), day_first, 1),
+                                            ("night", (set_, next_rise), night_first, NIGHT_STEP)):
+            for number, (start, end) in enumerate(_split(a, b, 8), 1):
+                name, lord, nature = CHOGHADIYA[(first + (number - 1) * step) % 7]
+                yield Choghadiya(date_obj, period, number, name, lord, nature, start, end)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hora / choghadiya tables")
+    parser.add_argument("--lat", type=float, required=True)
+    parser.add_argument("--lon", type=float, required=True)
+    parser.add_argument("--name", default="Location")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--choghadiya", action="store_true", help="choghadiya instead of hora")
+    parser.add_argument("--csv", action="store_true", help="CSV on stdout")
+    args = parser.parse_args(argv)
+
+    place = Place(args.lat, args.lon, args.name)
+    start = datetime.date.fromisoformat(args.start)
+    end = datetime.date.fromisoformat(args.end)
+    rows = (iter_choghadiyas if args.choghadiya else iter_horas)(place, start, end)
+    if args.csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow((Choghadiya if args.choghadiya else Hora)._fields)
+        for row in rows:
+            writer.writerow([v.isoformat() if hasattr(v, "isoformat") else v for v in row])
+    else:
+        for row in rows:
+            label = f"{row.name:<6} ({row.nature})" if args.choghadiya else f"{row.lord:<8}"
+            print(f"{row.date} {row.period:<5} {row.number:>2}  {label}  {row.start:%H:%M:%S} - {row.end:%H:%M:%S}")
+    print(f"sun events computed: {_sun_events.computed}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# lagna.py
+# Daily lagna (ascendant) timetable: the moment each sign rises over the eastern
+# horizon between one sunrise and the next, at a given place.
+#
+# The ascendant depends only on local sidereal time, the obliquity and the latitude,
+# so instead of calling swe.houses minute by minute each sign boundary is solved
+# directly: ecliptic longitude L is the ascendant when it sits on the eastern
+# horizon, i.e. at local sidereal time RA(L) - H0(L) with cos H0 = -tan(lat) tan(dec(L)).
+# That gives every regular ingress in closed form; the result agrees with
+# swe.houses' ascendant to well under a second (see --check).
+#
+# Inside the polar circles some longitudes never rise, and the ascendant flips by
+# ~180 degrees when the ecliptic's horizon crossing passes the north/south point.
+# Those flips are found by scanning the (vectorized) ascendant and bisecting on the
+# jump; signs are then read off between consecutive events, so skipped and
+# repeated signs come out right. No house system is involved, so there is no
+# Placidus breakdown to work around.
+#
+#   python lagna.py --lat 13.0827 --lon 80.2707 --date 2025-01-14
+#   python lagna.py --lat 13.0827 --lon 80.2707 --month 2025-01
+#   python lagna.py --check
+import argparse
+import datetime
+import sys
+import time
+from collections import namedtuple
+import numpy as np
+import pytz
+import swisseph as swe  # pyswisseph
+
+from panchang_core import ZODIAC
+from result_cache import TTLCache
+from sun_times import sun_times, zone_offsets, NORMAL, JD_UNIX_EPOCH
+from tz_resolver import get_timezone_resolver
+
+SIDEREAL_RATE = 360.98564736629  # degrees of sidereal time per day
+SCAN_STEP_DAYS = 1.0 / 1440.0  # one minute, for the polar flip scan only
+JUMP_DEG = 20.0  # ascendant moving this much within one scan step is treated as a flip
+BISECT_ITER = 24  # one minute / 2**24 ~ 4 microseconds
+POLAR_LATITUDE = 66.0  # below this the ascendant is continuous and no scan is needed
+CHECK_TOLERANCE_S = 1.0
+
+CACHE_SIZE = 4096
+CACHE_TTL = 7 * 86400.0  # timetables never change; bounded by size
+COORD_DECIMALS = 4
+
+# One row of the timetable: `sign` (sign_no 1..12) is the lagna from start to end.
+# The first row of a day starts at the window start (it rose before sunrise).
+Lagna = namedtuple("Lagna", ["sign_no", "sign", "start_jd", "end_jd", "start", "end"])
+
+_cache = TTLCache(CACHE_SIZE, CACHE_TTL)
+
+# ----------------------------
+# Geometry
+# ----------------------------
+def _wrap180(angle):
+    return (angle + 180.0) % 360.0 - 180.0
+
+def ascendant_at_lst(lst_deg, eps_deg, lat):
+    """Ascendant longitude (0..360) for local sidereal time(s) lst_deg; same as swe.houses."""
+    th = np.radians(lst_deg)
+    e = np.radians(eps_deg)
+    phi = np.radians(np.clip(lat, -89.99, 89.99))
+    asc = np.degrees(np.arctan2(np.cos(th), -(np.sin(th) * np.cos(e) + np.tan(phi) * np.sin(e))))
+    # the formula can return the western crossing inside the polar circles; keep the eastern one
+    ra = np.degrees(np.arctan2(np.sin(np.radians(asc)) * np.cos(e), np.cos(np.radians(asc))))
+    west = np.sin(np.radians(lst_deg - ra)) > 0.0
+    return np.where(west, asc + 180.0, asc) % 360.0
+
+def rising_lst(long_deg, eps_deg, lat):
+    """Local sidereal time (deg) at which ecliptic longitude long_deg is the ascendant; NaN if never."""
+    lam = np.radians(long_deg)
+    e = np.radians(eps_deg)
+    ra = np.degrees(np.arctan2(np.sin(lam) * np.cos(e), np.cos(lam)))
+    dec = np.arcsin(np.sin(lam) * np.sin(e))
+    cos_h0 = -np.tan(np.radians(np.clip(lat, -89.99, 89.99))) * np.tan(dec)
+    with np.errstate(invalid="ignore"):
+        h0 = np.degrees(np.arccos(np.where(np.abs(cos_h0) < 1.0, cos_h0, np.nan)))
+    return (ra - h0) % 360.0
+
+# ----------------------------
+# Timetable
+# ----------------------------
+def _day_windows(lat, lon, dates, tz):
+    # (start, end) JD per date: sunrise -> next sunrise, or local midnight -> midnight in polar day/night
+    # each date and the day after; `dates` need not be contiguous (only cache misses)
+    days = sorted(set(dates) | {d + datetime.timedelta(days=1) for d in dates})
+    res = sun_times(lat, lon, days, utc_offsets=zone_offsets(tz, days))
+    rise = dict(zip(days, res["sunrise"][0]))
+    ok = dict(zip(days, res["status"][0] == NORMAL))
+    windows = []
+    for date_obj in dates:
+        next_day = date_obj + datetime.timedelta(days=1)
+        if ok[date_obj] and ok[next_day]:
+            windows.append((rise[date_obj], rise[next_day]))
+        else:
+            midnight = tz.localize(datetime.datetime.combine(date_obj, datetime.time()))
+            jd0 = JD_UNIX_EPOCH + midnight.timestamp() / 86400.0
+            windows.append((jd0, jd0 + 1.0))
+    return windows
+
+def _flips(jd_start, jd_end, lst0, eps, lat):
+    # times where the ascendant jumps (polar latitudes): scan, then bisect each jump
+    t = np.arange(jd_start, jd_end + SCAN_STEP_DAYS, SCAN_STEP_DAYS)
+    asc = ascendant_at_lst(lst0 + SIDEREAL_RATE * (t - jd_start), eps, lat)
+    jump = np.nonzero(np.abs(_wrap180(np.diff(asc))) > JUMP_DEG)[0]
+    if jump.size == 0:
+        return np.empty(0)
+    a, b = t[jump], t[jump + 1]
+    asc_a, asc_b = asc[jump], asc[jump + 1]
+    for _ in range(BISECT_ITER):
+        m = (a + b) / 2.0
+        asc_m = ascendant_at_lst(lst0 + SIDEREAL_RATE * (m - jd_start), eps, lat)
+        left = np.abs(_wrap180(asc_m - asc_a)) > np.abs(_wrap180(asc_b - asc_m))
+        b, asc_b = np.where(left, m, b), np.where(left, asc_m, asc_b)
+        a, asc_a = np.where(left, a, m), np.where(left, asc_a, asc_m)
+    return (a + b) / 2.0
+
+def _timetable(lat, lon, jd_start, jd_end, tz):
+    lst0 = (swe.sidtime(jd_start) * 15.0 + lon) % 360.0
+    eps = swe.calc_ut((jd_start + jd_end) / 2.0, swe.ECL_NUT)[0][0]
+
+    # every time a sign boundary is on the eastern horizon inside the window
+    boundary_lst = rising_lst(np.arange(12) * 30.0, eps, lat)
+    boundary_lst = boundary_lst[~np.isnan(boundary_lst)]
+    first = jd_start + ((boundary_lst - lst0) % 360.0) / SIDEREAL_RATE
+    sidereal_day = 360.0 / SIDEREAL_RATE
+    events = np.concatenate([first, first + sidereal_day])  # windows are at most ~1.1 days
+    events = events[events < jd_end]
+    if abs(lat) >= POLAR_LATITUDE:
+        events = np.concatenate([events, _flips(jd_start, jd_end, lst0, eps, lat)])
+    edges = np.unique(np.concatenate([[jd_start], events, [jd_end]]))
+
+    # the lagna of each interval, read at its midpoint
+    mids = (edges[:-1] + edges[1:]) / 2.0
+    signs = (ascendant_at_lst(lst0 + SIDEREAL_RATE * (mids - jd_start), eps, lat) // 30.0).astype(int) + 1
+    rows = []
+    for sign_no, start, end in zip(signs, edges[:-1], edges[1:]):
+        if rows and rows[-1][0] == sign_no:
+            rows[-1][2] = end  # e.g. a boundary touched but not crossed
+        else:
+            rows.append([int(sign_no), start, end])
+    return [Lagna(sign_no, ZODIAC[sign_no - 1], float(start), float(end), _local(start, tz), _local(end, tz))
+            for sign_no, start, end in rows]
+
+def _local(jd, tz):
+    # to the nearest second, so that midnight windows print as 00:00:00
+    seconds = round((jd - JD_UNIX_EPOCH) * 86400.0)
+    return (datetime.datetime(1970, 1, 1, tzinfo=pytz.utc) + datetime.timedelta(seconds=seconds)).astimezone(tz)
+
+def _key(lat, lon, date_obj):
+    return (round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), date_obj.isoformat())
+
+def lagna_timetables(lat, lon, dates, tz_str=None):
+    """Lagna timetables for several dates at one place (list of lists of Lagna rows).
+
+    Cached per (location, date); the dates that miss share one sunrise computation.
+    """
+    dates = list(dates)
+    tz_str = tz_str or get_timezone_resolver().timezone_name(lat, lon)
+    tz = pytz.timezone(tz_str)
+    out = [_cache.get(_key(lat, lon, d) + (tz_str,)) for d in dates]
+    missing = [i for i, rows in enumerate(out) if rows is None]
+    if missing:
+        windows = _day_windows(lat, lon, [dates[i] for i in missing], tz)
+        for i, (jd_start, jd_end) in zip(missing, windows):
+            out[i] = _timetable(lat, lon, jd_start, jd_end, tz)
+            _cache.put(_key(lat, lon, dates[i]) + (tz_str,), out[i])
+    return out
+
+def lagna_timetable(lat, lon, date_obj, tz_str=None):
+    return lagna_timetables(lat, lon, [date_obj], tz_str)[0]
+
+def lagna_month(lat, lon, year, month, tz_str=None):
+    """{date: [Lagna, ...]} for every day of the month."""
+    first = datetime.date(year, month, 1)
+    n_days = ((first.replace(day=28) + datetime.timedelta(days=4)).replace(day=1) - first).days
+    dates = [first + datetime.timedelta(days=d) for d in range(n_days)]
+    return dict(zip(dates, lagna_timetables(lat, lon, dates, tz_str)))
+
+def cache_stats():
+    return _cache.stats()
+
+# ----------------------------
+# Cross-check against swe.houses
+# ----------------------------
+def check(n_places=40, n_days=10, seed=0):
+    """Worst disagreement with swe.houses: boundary ascendant (s of time) and interval signs."""
+    rng = np.random.default_rng(seed)
+    worst_s = 0.0
+    sign_mismatches = 0
+    intervals = 0
+    for _ in range(n_places):
+        lat, lon = rng.uniform(-75.0, 75.0), rng.uniform(-180.0, 180.0)
+        start = datetime.date(2025, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 365)))
+        dates = [start + datetime.timedelta(days=d) for d in range(n_days)]
+        for rows in lagna_timetables(lat, lon, dates, "UTC"):
+            for row in rows:
+                intervals += 1
+                mid = (row.start_jd + row.end_jd) / 2.0
+                asc_mid = swe.houses_ex(mid, lat, lon, b'E')[1][0]
+                if int(asc_mid // 30.0) + 1 != row.sign_no:
+                    sign_mismatches += 1
+            if abs(lat) < POLAR_LATITUDE:
+                # each regular ingress: swe's ascendant there must be on the boundary
+                for row in rows[1:]:
+                    asc, speed = _asc_and_speed(row.start_jd, lat, lon)
+                    err = abs(_wrap180(asc - (row.sign_no - 1) * 30.0)) / speed * 86400.0
+                    worst_s = max(worst_s, err)
+    return {"boundary_s": worst_s, "sign_mismatches": sign_mismatches, "intervals": intervals}
+
+def _asc_and_speed(jd, lat, lon, dt=1e-5):
+    a0 = swe.houses_ex(jd, lat, lon, b'E')[1][0]
+    a1 = swe.houses_ex(jd + dt, lat, lon, b'E')[1][0]
+    return a0, abs(_wrap180(a1 - a0)) / dt
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily lagna (ascendant) timetable")
+    parser.add_argument("--lat", type=float, default=13.0827)
+    parser.add_argument("--lon", type=float, default=80.2707)
+    parser.add_argument("--date", default=None, help="YYYY-MM-DD (default today)")
+    parser.add_argument("--month", default=None, help="YYYY-MM: time a whole month")
+    parser.add_argument("--check", action="store_true", help="cross-check against swe.houses")
+    args = parser.parse_args(argv)
+    swe.set_ephe_path('.')
+
+    if args.check:
+        res = check()
+        print(f"max boundary error = {res['boundary_s']:.4f} s (tolerance {CHECK_TOLERANCE_S} s)")
+        print(f"interval sign mismatches = {res['sign_mismatches']} of {res['intervals']}")
+        return 0 if res["boundary_s"] <= CHECK_TOLERANCE_S and res["sign_mismatches"] == 0 else 1
+    if args.month:
+        year, month = (int(x) for x in args.month.split("-"))
+        t0 = time.perf_counter()
+        table = lagna_month(args.lat, args.lon, year, month)
+        t1 = time.perf_counter()
+        lagna_month(args.lat, args.lon, year, month)
+        t2 = time.perf_counter()
+        for date_obj, rows in table.items():
+            print(date_obj, " ".join(f"{r.sign[:3]}@{r.start:%H:%M}" for r in rows))
+        print(f"{len(table)} days in {(t1 - t0) * 1000:.1f} ms (cached: {(t2 - t1) * 1000:.2f} ms)", file=sys.stderr)
+        return 0
+    date_obj = datetime.date.fromisoformat(args.date) if args.date else datetime.date.today()
+    for row in lagna_timetable(args.lat, args.lon, date_obj):
+        print(f"{row.sign:<12} {row.start:%Y-%m-%d %H:%M:%S} -> {row.end:%Y-%m-%d %H:%M:%S %Z}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
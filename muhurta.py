@@ -0,0 +1,301 @@
+# muhurta.py
+# Muhurta search: "every date in 2027 when the Moon is in Rohini and the lagna at
+# sunrise is Taurus, for Chennai" without recomputing a single day.
+#
+# A table is built once per location and span (sunrise panchang from
+# panchang_batch, plus tithi and weekday) and stored on disk as a directory of
+# column files with a bitmap index per categorical column:
+#
+#   <dir>/meta.json              location, timezone, span, columns
+#   <dir>/<column>.npy           one array per column (memory-mapped when opened)
+#   <dir>/idx_<column>.npy       (n_values + 1, n_rows / 8) packed bitmaps, row r of
+#                                value v is set when column[r] == v (0 = undefined)
+#
+# Conditions on the indexed columns at sunrise are answered by OR-ing the bitmaps
+# of the allowed values and AND-ing across columns. Ranges on the continuous
+# columns (degrees) are then checked on the surviving rows only.
+#
+# "during_*" conditions ask whether something holds at any moment of the day
+# (sunrise to next sunrise). Moon longitude and Moon-Sun elongation only increase,
+# so the values a day passes through are the cyclic range from its sunrise value to
+# the next day's, which the table already holds. That decides a single condition
+# exactly. Several during-conditions must hold at the *same* moment, which the
+# table cannot tell, so for the remaining candidate days the transition times are
+# computed with panchang_events and the overlapping windows are returned.
+#
+#   python muhurta.py build chennai.muhurta --lat 13.0827 --lon 80.2707 --start 2000-01-01 --end 2050-12-31
+#   python muhurta.py query chennai.muhurta moon_nakshatra=Rohini asc_sign=Taurus --from 2027-01-01 --to 2027-12-31
+#   python muhurta.py query chennai.muhurta during_nakshatra=Rohini during_tithi="Shukla Panchami" --windows
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+import numpy as np
+import pytz
+
+from panchang_batch import ZODIAC, NAKSHATRA, compute_panchang_range
+from panchang_events import TITHI, EventFinder, jd_to_datetime
+
+FORMAT_VERSION = 1
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# indexed column -> value names (value v is names[v - 1]; 0 means undefined)
+INDEXED = {
+    "asc_sign": ZODIAC, "sun_sign": ZODIAC, "moon_sign": ZODIAC,
+    "sun_nakshatra": NAKSHATRA, "moon_nakshatra": NAKSHATRA,
+    "sun_pada": None, "moon_pada": None,
+    "sun_house": None, "moon_house": None,
+    "tithi": TITHI, "weekday": WEEKDAYS,
+}
+CARDINALITY = {"asc_sign": 12, "sun_sign": 12, "moon_sign": 12, "sun_nakshatra": 27, "moon_nakshatra": 27,
+               "sun_pada": 4, "moon_pada": 4, "sun_house": 12, "moon_house": 12, "tithi": 30, "weekday": 7}
+# panchang_batch column each indexed column is taken from
+_SOURCE = {"asc_sign": "asc_sign_no", "sun_sign": "sun_sign_no", "moon_sign": "moon_sign_no",
+           "sun_nakshatra": "sun_nakshatra_no", "moon_nakshatra": "moon_nakshatra_no",
+           "sun_pada": "sun_pada", "moon_pada": "moon_pada", "sun_house": "sun_house", "moon_house": "moon_house"}
+CONTINUOUS = ["jd_ut", "ascendant_deg", "asc_deg_in_sign",
+              "sun_ecliptic_long", "sun_deg_in_sign", "sun_deg_into_nak", "sun_deg_in_house",
+              "moon_ecliptic_long", "moon_deg_in_sign", "moon_deg_into_nak", "moon_deg_in_house", "elongation"]
+# during_<name> -> (indexed column it moves through, panchang_events kind)
+DURING = {"during_nakshatra": ("moon_nakshatra", "nakshatra"),
+          "during_moon_sign": ("moon_sign", "moon_sign"),
+          "during_tithi": ("tithi", "tithi")}
+
+# One matching day. `windows` lists (start, end) local datetimes when every
+# during-condition holds at once (None if no windows were asked for).
+Match = namedtuple("Match", ["date", "sunrise", "windows"])
+
+# ----------------------------
+# Building
+# ----------------------------
+def build_table(path, location_obj, start_date, end_date, tz_str=None, log=None):
+    """Compute the panchang for [start_date, end_date] at one place and write it to `path`."""
+    t0 = time.perf_counter()
+    # one extra day: the next sunrise closes the last day's window
+    cols = compute_panchang_range(location_obj, start_date, end_date + datetime.timedelta(days=1), tz_str)
+    n = len(cols["date"])
+    valid = ~np.isnan(cols["jd_ut"])
+    elongation = (cols["moon_ecliptic_long"] - cols["sun_ecliptic_long"]) % 360.0
+    tithi = np.where(valid, np.nan_to_num(elongation) // 12.0 + 1, 0).astype(np.int8)
+    weekday = (cols["date"].astype(np.int64) + 3) % 7 + 1  # 1970-01-01 was a Thursday
+
+    columns = {"date": cols["date"].astype(np.int64), "elongation": elongation, "tithi": tithi,
+               "weekday": weekday.astype(np.int8)}
+    for name in CONTINUOUS:
+        columns.setdefault(name, cols.get(name))
+    for name, source in _SOURCE.items():
+        columns[name] = np.where(valid, cols[source], 0).astype(np.int8)
+
+    os.makedirs(path, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(path, name + ".npy"), values)
+    for name, card in CARDINALITY.items():
+        bitmaps = np.stack([np.packbits(columns[name] == v) for v in range(card + 1)])
+        np.save(os.path.join(path, f"idx_{name}.npy"), bitmaps)
+    meta = {
+        "version": FORMAT_VERSION,
+        "latitude": float(cols["latitude"][0]), "longitude": float(cols["longitude"][0]),
+        "timezone": cols["timezone"], "start": start_date.isoformat(), "end": end_date.isoformat(),
+        "n_days": n - 1, "columns": sorted(columns),
+    }
+    # meta.json last: a table without it is incomplete
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    if log:
+        print(f"{n - 1} days written to {path} in {time.perf_counter() - t0:.2f} s", file=log)
+    return MuhurtaTable(path)
+
+# ----------------------------
+# Querying
+# ----------------------------
+def _codes(column, value):
+    # value name(s)/number(s) -> set of codes for an indexed column
+    values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+    names = INDEXED[column]
+    codes = set()
+    for v in values:
+        if isinstance(v, str) and not v.strip().isdigit():
+            if names is None:
+                raise ValueError(f"{column} takes numbers, not {v!r}")
+            lookup = {n.lower(): i + 1 for i, n in enumerate(names)}
+            code = lookup.get(v.strip().lower())
+            if code is None:
+                raise ValueError(f"Unknown {column} {v!r}")
+        else:
+            code = int(v)
+            if not 1 <= code <= CARDINALITY[column]:
+                raise ValueError(f"{column} must be 1..{CARDINALITY[column]}, got {code}")
+        codes.add(code)
+    return codes
+
+class MuhurtaTable:
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported table version {self.meta.get('version')}")
+        self.path = path
+        self.n_days = self.meta["n_days"]
+        self.tz = pytz.timezone(self.meta["timezone"])
+        self.start = datetime.date.fromisoformat(self.meta["start"])
+        self._columns = {}
+        self._indexes = {}
+
+    def column(self, name):
+        """Full column (n_days + 1 rows: the last row is the day after the span)."""
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.path, name + ".npy"), mmap_mode="r")
+        return self._columns[name]
+
+    def _bitmap(self, name, codes):
+        if name not in self._indexes:
+            self._indexes[name] = np.load(os.path.join(self.path, f"idx_{name}.npy"), mmap_mode="r")
+        index = self._indexes[name]
+        return np.bitwise_or.reduce(index[sorted(codes)], axis=0)
+
+    def _rows(self, start, end):
+        lo = 0 if start is None else max(0, (start - self.start).days)
+        hi = self.n_days if end is None else min(self.n_days, (end - self.start).days + 1)
+        return lo, max(lo, hi)
+
+    def candidates(self, conditions, start=None, end=None):
+        """Row numbers that satisfy every condition the table alone can decide."""
+        lo, hi = self._rows(start, end)
+        n_bytes = (self.n_days + 1 + 7) // 8
+        mask = np.full(n_bytes, 0xFF, dtype=np.uint8)
+        ranges = []
+        during = []
+        for key, value in conditions.items():
+            if key in INDEXED:
+                mask &= self._bitmap(key, _codes(key, value))
+            elif key in CONTINUOUS:
+                low, high = value
+                ranges.append((key, low, high))
+            elif key in DURING:
+                during.append((key, value))
+            else:
+                raise ValueError(f"Unknown condition {key!r}")
+        rows = np.flatnonzero(np.unpackbits(mask)[lo:hi]) + lo
+        for key, low, high in ranges:
+            values = self.column(key)[rows]
+            rows = rows[(values >= low) & (values <= high)]
+        for key, value in during:
+            rows = rows[self._passes_through(key, value, rows)]
+        return rows
+
+    def _passes_through(self, key, value, rows):
+        # does the day pass through one of the codes? cyclic range sunrise value .. next sunrise value
+        column, _ = DURING[key]
+        card = CARDINALITY[column]
+        codes = np.array(sorted(_codes(column, value)))
+        first = self.column(column)[rows].astype(np.int64)
+        last = self.column(column)[rows + 1].astype(np.int64)
+        span = (last - first) % card
+        offset = (codes[None, :] - first[:, None]) % card
+        return ((offset <= span[:, None]).any(axis=1)) & (first > 0) & (last > 0)
+
+    def _windows(self, row, during):
+        # when, between this sunrise and the next, all during-conditions hold at once
+        jd_start, jd_end = float(self.column("jd_ut")[row]), float(self.column("jd_ut")[row + 1])
+        wanted = {DURING[key][1]: _codes(DURING[key][0], value) for key, value in during.items()}
+        state = {DURING[key][1]: int(self.column(DURING[key][0])[row]) for key in during}
+        windows = []
+        open_at = jd_start if all(state[k] in wanted[k] for k in wanted) else None
+        for event in EventFinder().iter_events(jd_start, jd_end, wanted.keys()):
+            if event.kind not in wanted:
+                continue
+            state[event.kind] = event.number
+            ok = all(state[k] in wanted[k] for k in wanted)
+            if ok and open_at is None:
+                open_at = event.jd_ut
+            elif not ok and open_at is not None:
+                windows.append((open_at, event.jd_ut))
+                open_at = None
+        if open_at is not None:
+            windows.append((open_at, jd_end))
+        return windows
+
+    def query(self, conditions=None, start=None, end=None, windows=False, **kwargs):
+        """Days matching every condition, as Match rows in date order.
+
+        Conditions: indexed columns at sunrise (name(s) or number(s)), continuous
+        columns as (low, high), and during_nakshatra / during_moon_sign /
+        during_tithi. Windows are computed when asked for, or when more than one
+        during-condition is given (then days without a common window are dropped).
+        """
+        conditions = dict(conditions or {}, **kwargs)
+        during = {k: v for k, v in conditions.items() if k in DURING}
+        rows = self.candidates(conditions, start, end)
+        need_windows = windows or len(during) > 1
+        dates = self.column("date")
+        jd_ut = self.column("jd_ut")
+        out = []
+        for row in rows:
+            found = None
+            if need_windows and during:
+                found = [(jd_to_datetime(a, self.tz), jd_to_datetime(b, self.tz)) for a, b in self._windows(row, during)]
+                if not found:
+                    continue
+            date_obj = self.start + datetime.timedelta(days=int(dates[row] - dates[0]))
+            out.append(Match(date_obj, jd_to_datetime(float(jd_ut[row]), self.tz), found))
+        return out
+
+def open_table(path):
+    return MuhurtaTable(path)
+
+# ----------------------------
+# CLI
+# ----------------------------
+def _parse_condition(text):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected column=value, got {text!r}")
+    key = key.strip()
+    if key in CONTINUOUS:
+        low, _, high = value.partition(":")
+        return key, (float(low), float(high))
+    values = [v.strip() for v in value.split(",")]
+    return key, values if len(values) > 1 else values[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indexed muhurta search over a precomputed panchang table")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compute and store a table")
+    build.add_argument("path")
+    build.add_argument("--lat", type=float, required=True)
+    build.add_argument("--lon", type=float, required=True)
+    build.add_argument("--name", default="")
+    build.add_argument("--start", required=True, help="YYYY-MM-DD")
+    build.add_argument("--end", required=True, help="YYYY-MM-DD")
+    query = sub.add_parser("query", help="list matching days")
+    query.add_argument("path")
+    query.add_argument("conditions", nargs="+", type=_parse_condition,
+                       help="column=value[,value...] or continuous_column=low:high")
+    query.add_argument("--from", dest="start", default=None, help="YYYY-MM-DD")
+    query.add_argument("--to", dest="end", default=None, help="YYYY-MM-DD")
+    query.add_argument("--windows", action="store_true", help="also print when during-conditions hold")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_table(args.path, (args.lat, args.lon, args.name), datetime.date.fromisoformat(args.start),
+                    datetime.date.fromisoformat(args.end), log=sys.stderr)
+        return 0
+    table = MuhurtaTable(args.path)
+    start = datetime.date.fromisoformat(args.start) if args.start else None
+    end = datetime.date.fromisoformat(args.end) if args.end else None
+    t0 = time.perf_counter()
+    matches = table.query(dict(args.conditions), start, end, windows=args.windows)
+    elapsed = time.perf_counter() - t0
+    for m in matches:
+        line = f"{m.date.isoformat()}  sunrise {m.sunrise:%H:%M:%S}"
+        if m.windows:
+            line += "  " + ", ".join(f"{a:%d %H:%M}-{b:%d %H:%M}" for a, b in m.windows)
+        print(line)
+    print(f"{len(matches)} matching days in {elapsed * 1000:.2f} ms", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,176 +1,71 @@
 # sunrise_panchang.py
 import streamlit as st
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
-from astral import LocationInfo
-from astral.sun import sun
-import pytz
+from geocoder import suggest_locations
 import datetime
-import swisseph as swe  # pyswisseph
-import math
+import panchang_core
+import timing
+import result_cache
+import reference_data
+from panchang_core import deg_to_sign
+from lagna import lagna_timetable, lagna_month
+
+# stage timings of this script run (only filled in when PANCHANG_TIMING=1)
+timing_spans = []
 
 # ----------------------------
 # Helper: location suggestions
 # ----------------------------
+def _debounce_lookup(query):
+    # typing pause before a real lookup; a newer keystroke stops this run at the st call
+    if result_cache.debounce(st.session_state, "_geocode_debounce", query):
+        st.empty()
+
 def get_location_suggestions(query, country_hint=None):
-    geolocator = Nominatim(user_agent="hora_gui", timeout=10)
+    # offline gazetteer first, Nominatim only as a fallback (see geocoder.py);
+    # repeated (query, country) pairs are answered from the session/process caches
     try:
-        country_map = {
-            "India":"IN","United States":"US","United Kingdom":"GB","Canada":"CA",
-            "Australia":"AU","Singapore":"SG","UAE":"AE","Germany":"DE","France":"FR"
-        }
-        country_code = country_map.get(country_hint, None)
-        q = f"{query}, {country_hint}" if country_hint and country_hint != "Other" else query
-        locations = geolocator.geocode(q, exactly_one=False, limit=6, addressdetails=True, country_codes=country_code)
-        return locations or []
+        with timing.trace() as spans:
+            result = result_cache.cached_suggestions(
+                query, country_hint, 6, suggest_locations,
+                session_cache=result_cache.SessionCache.of(st.session_state, "_suggestion_cache"),
+                before_lookup=lambda: _debounce_lookup(query),
+            )
+        timing_spans.extend(spans)
+        return result
     except Exception as e:
         st.warning(f"Geocoding issue: {e}")
         return []
 
-# ----------------------------
-# Astronomy helpers (swisseph)
-# ----------------------------
-# Zodiac & Nakshatra names
-ZODIAC = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"]
-NAKSHATRA = [
-    "Ashwini","Bharani","Krittika","Rohini","Mrigashira","Ardra","Punarvasu",
-    "Pushya","Ashlesha","Magha","Purva Phalguni","Uttara Phalguni","Hasta",
-    "Chitra","Swati","Vishakha","Anuradha","Jyeshtha","Moola","Purva Ashadha",
-    "Uttara Ashadha","Shravana","Dhanishta","Shatabhisha","Purva Bhadrapada",
-    "Uttara Bhadrapada","Revati"
-]
-
-# Convert local time -> UTC julian day UT for swisseph
-def datetime_to_julday_utc(dt_local, tz):
-    # dt_local: naive or tz-aware local datetime
-    if dt_local.tzinfo is None:
-        local = tz.localize(dt_local)
-    else:
-        local = dt_local.astimezone(tz)
-    dt_utc = local.astimezone(pytz.utc)
-    year = dt_utc.year
-    month = dt_utc.month
-    day = dt_utc.day
-    hour = dt_utc.hour + dt_utc.minute/60.0 + dt_utc.second/3600.0 + dt_utc.microsecond/(3600.0*1e6)
-    jd = swe.julday(year, month, day, hour)
-    return jd
-
-# Normalize angle to 0-360
-def norm(angle):
-    a = angle % 360.0
-    if a < 0:
-        a += 360.0
-    return a
-
-def deg_to_sign(long_deg):
-    sign = int(long_deg // 30)  # 0..11
-    deg_in_sign = long_deg % 30
-    return ZODIAC[sign], sign+1, deg_in_sign  # sign name, sign number 1..12, degrees in sign
-
-def calc_nakshatra_and_pada(long_deg):
-    # total 360 deg divided into 27 nakshatras -> each 13 1/3 deg = 360/27
-    nak_size = 360.0 / 27.0  # 13.333...
-    pada_size = nak_size / 4.0  # 3.333...
-    idx = int(long_deg // nak_size)  # 0..26
-    nak = NAKSHATRA[idx]
-    deg_into_nak = long_deg - (idx * nak_size)
-    pada = int(deg_into_nak // pada_size) + 1  # 1..4
-    return idx+1, nak, pada, deg_into_nak  # nakshatra number (1..27), name, pada, degrees into nak
-
-def compute_house(planet_long, asc_long):
-    # Houses are 30-degree slices starting from ascendant
-    rel = (planet_long - asc_long) % 360.0
-    house = int(rel // 30.0) + 1  # house 1..12
-    deg_in_house = rel % 30.0
-    return house, deg_in_house
-
 # ----------------------------
 # Primary logic: sunrise + positions
 # ----------------------------
 def fetch_sunrise_and_positions(location_obj, date_obj):
+    # computation lives in panchang_core; errors are reported in the UI here.
+    # Results are cached per (lat, lon, date), so revisiting a date is instant.
     try:
-        lat = round(location_obj.latitude, 6)
-        lon = round(location_obj.longitude, 6)
-
-        tz_finder = TimezoneFinder()
-        tz_str = tz_finder.timezone_at(lng=lon, lat=lat)
-        if tz_str:
-            tz = pytz.timezone(tz_str)
-        else:
-            tz = pytz.utc
-            tz_str = "UTC"
-
-        # get sunrise time using astral
-        city_short = location_obj.address.split(",")[0]
-        city = LocationInfo(city_short, "", tz_str, lat, lon)
-        s = sun(city.observer, date=date_obj, tzinfo=tz)
-        sunrise_dt_local = s["sunrise"]  # timezone-aware
-
-        # convert to julian day UT for swisseph (needs UT)
-        jd_ut = datetime_to_julday_utc(sunrise_dt_local, tz)
-
-        # ensure ephemeris
-        # (optionally set a path: swe.set_ephe_path("/path/to/ephe") )
-        swe.set_ephe_path('.')  # current directory try; swisseph uses internal if not found
-
-        # Compute ascendant (house cusps)
-        # swe.houses(jd_ut, lat, lon, hsys='P') returns (cusps, ascmc) where ascmc[0] is ascendant
-        cusps, ascmc = swe.houses(jd_ut, lat, lon, hsys='P')  # Placidus
-        ascendant = norm(ascmc[0])  # degrees
-
-        # Planetary longitudes (ecliptic)
-        sun_ecl = norm(swe.calc_ut(jd_ut, swe.SUN)[0][0])  # returns (lon, lat, dist)
-        moon_ecl = norm(swe.calc_ut(jd_ut, swe.MOON)[0][0])
-
-        # Sun details
-        sun_sign, sun_sign_no, sun_deg_in_sign = deg_to_sign(sun_ecl)
-        sun_nak_no, sun_nak_name, sun_pada, sun_deg_into_nak = calc_nakshatra_and_pada(sun_ecl)
-        sun_house, sun_deg_in_house = compute_house(sun_ecl, ascendant)
-
-        # Moon details
-        moon_sign, moon_sign_no, moon_deg_in_sign = deg_to_sign(moon_ecl)
-        moon_nak_no, moon_nak_name, moon_pada, moon_deg_into_nak = calc_nakshatra_and_pada(moon_ecl)
-        moon_house, moon_deg_in_house = compute_house(moon_ecl, ascendant)
-
-        out = {
-            "latitude": lat,
-            "longitude": lon,
-            "timezone": tz_str,
-            "sunrise_local": sunrise_dt_local,
-            "jd_ut": jd_ut,
-            "ascendant_deg": ascendant,
-            "sun": {
-                "ecliptic_long": sun_ecl,
-                "sign": sun_sign,
-                "sign_no": sun_sign_no,
-                "deg_in_sign": sun_deg_in_sign,
-                "nakshatra_no": sun_nak_no,
-                "nakshatra": sun_nak_name,
-                "pada": sun_pada,
-                "deg_into_nak": sun_deg_into_nak,
-                "house": sun_house,
-                "deg_in_house": sun_deg_in_house
-            },
-            "moon": {
-                "ecliptic_long": moon_ecl,
-                "sign": moon_sign,
-                "sign_no": moon_sign_no,
-                "deg_in_sign": moon_deg_in_sign,
-                "nakshatra_no": moon_nak_no,
-                "nakshatra": moon_nak_name,
-                "pada": moon_pada,
-                "deg_into_nak": moon_deg_into_nak,
-                "house": moon_house,
-                "deg_in_house": moon_deg_in_house
-            }
-        }
-
-        return out
-
+        with timing.trace() as spans:
+            result = result_cache.cached_chart(
+                "panchang", location_obj, date_obj, panchang_core.fetch_sunrise_and_positions,
+                session_cache=result_cache.SessionCache.of(st.session_state, "_chart_cache"),
+            )
+        timing_spans.extend(spans)
+        return result
     except Exception as e:
         st.error(f"Error computing positions: {e}")
         return None
 
+def show_lagna_timetable(lat, lon, date_obj, tz_str=None):
+    st.subheader("Lagna timetable (sunrise to next sunrise)")
+    lagnas = lagna_timetable(lat, lon, date_obj, tz_str)
+    st.table([{"Lagna": r.sign, "From": r.start.strftime('%d-%m %H:%M:%S'), "To": r.end.strftime('%d-%m %H:%M:%S')}
+              for r in lagnas])
+    with st.expander(f"Lagna rising times for {date_obj.strftime('%B %Y')}"):
+        month = lagna_month(lat, lon, date_obj.year, date_obj.month, tz_str)
+        # rows[0] starts at the window start (sunrise), not at a rising; reversed so a
+        # sign rising twice in one window shows its first rising
+        st.dataframe([{"Date": d.strftime('%d-%m-%Y'), **{r.sign: r.start.strftime('%H:%M') for r in reversed(rows[1:])}}
+                      for d, rows in month.items()])
+
 # ----------------------------
 # Streamlit UI
 # ----------------------------
@@ -215,6 +110,9 @@ if st.button("Get Sunrise & Positions") and location_choice and date_obj:
         st.subheader("Ascendant (Lagna)")
         asc_sign, asc_sign_no, asc_deg_in_sign = deg_to_sign(data['ascendant_deg'])
         st.write(f"Ascendant: {asc_sign} ({round(data['ascendant_deg'],3)}°) — Sign number {asc_sign_no}, {round(asc_deg_in_sign,3)}° into sign")
+        lagna_ref = reference_data.frame("lagna").loc[asc_sign_no]
+        labels = [reference_data.LAGNA[f][0] for f in ("lord", "badhaka", "maraka")]
+        st.write(" — ".join(f"{label}: {lagna_ref[label]}" for label in labels))
 
         st.subheader("Sun at Sunrise")
         sun = data['sun']
@@ -230,10 +128,17 @@ if st.button("Get Sunrise & Positions") and location_choice and date_obj:
         st.write(f"Nakshatra: {moon['nakshatra']} (#{moon['nakshatra_no']}) — Pada/Patham: {moon['pada']} — {round(moon['deg_into_nak'],4)}° into nakshatra")
         st.write(f"House (from Ascendant): {moon['house']} — {round(moon['deg_in_house'],4)}° into that house")
 
+        show_lagna_timetable(data['latitude'], data['longitude'], date_obj, data['timezone'])
+
         # small map and raw output
         st.map({'lat':[data['latitude']],'lon':[data['longitude']]})
         st.write("---")
         st.write("Raw data (for debugging):")
         st.json(data)
+        if timing.enabled():
+            st.write("Timing breakdown (ms):")
+            st.json({name: round(ms, 3) for name, ms in timing.breakdown(timing_spans).items()})
     else:
         st.error("Failed to compute positions.")
+        # the timetable needs no sunrise (polar day/night use midnight to midnight)
+        show_lagna_timetable(round(location_choice.latitude, 6), round(location_choice.longitude, 6), date_obj)
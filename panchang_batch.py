@@ -0,0 +1,205 @@
+# panchang_batch.py
+# Batch panchang engine: the same numbers as panchang_core.fetch_sunrise_and_positions,
+# but for a whole date range (and optionally many locations) in one call.
+# Results are columnar NumPy arrays (one entry per day) instead of nested dicts.
+import datetime
+import numpy as np
+import pytz
+import swisseph as swe  # pyswisseph
+from tz_resolver import get_timezone_resolver
+from sun_times import sun_times, zone_offsets, jd_to_datetime64, JD_UNIX_EPOCH
+from ephemeris_cache import get_ephemeris_cache
+import panchang_core
+
+# Zodiac & Nakshatra names as arrays, so codes can be mapped to names in one step
+ZODIAC = np.array(panchang_core.ZODIAC)
+NAKSHATRA = np.array(panchang_core.NAKSHATRA)
+
+NAK_SIZE = 360.0 / 27.0   # 13.333...
+PADA_SIZE = NAK_SIZE / 4.0  # 3.333...
+
+# ----------------------------
+# Vectorized helpers
+# ----------------------------
+# Same results as norm / deg_to_sign / calc_nakshatra_and_pada / compute_house
+# in panchang_core.py, but operating on whole arrays. Names are left out on purpose:
+# look them up with ZODIAC[sign_no - 1] / NAKSHATRA[nak_no - 1] when needed.
+def _bucket(values, size, count):
+    # floor(values / size) as a small int in 0..count-1; NaN maps to 0
+    idx = np.nan_to_num(np.asarray(values, dtype=float) // size)
+    return np.clip(idx, 0, count - 1).astype(np.int8)
+
+def norm_vec(angle):
+    a = np.mod(np.asarray(angle, dtype=float), 360.0)
+    # float modulo can round a tiny negative angle up to exactly 360.0
+    return np.where(a >= 360.0, 0.0, a)
+
+def deg_to_sign_vec(long_deg):
+    long_deg = np.asarray(long_deg, dtype=float)
+    sign_idx = _bucket(long_deg, 30.0, 12)  # 0..11
+    deg_in_sign = long_deg % 30.0
+    return sign_idx + 1, deg_in_sign  # sign number 1..12, degrees in sign
+
+def calc_nakshatra_and_pada_vec(long_deg):
+    long_deg = np.asarray(long_deg, dtype=float)
+    idx = _bucket(long_deg, NAK_SIZE, 27)  # 0..26
+    deg_into_nak = long_deg - idx * NAK_SIZE
+    pada = _bucket(deg_into_nak, PADA_SIZE, 4) + 1  # 1..4
+    return idx + 1, pada, deg_into_nak  # nakshatra number 1..27, pada, degrees into nak
+
+def compute_house_vec(planet_long, asc_long):
+    rel = np.mod(np.asarray(planet_long, dtype=float) - np.asarray(asc_long, dtype=float), 360.0)
+    house = _bucket(rel, 30.0, 12) + 1  # house 1..12
+    deg_in_house = rel % 30.0
+    return house, deg_in_house
+
+def datetimes_to_julday_utc(dts_utc):
+    # datetime64 (UTC) array -> julian day UT; same as swe.julday on the UTC fields
+    seconds = np.asarray(dts_utc, dtype="datetime64[us]").astype(np.int64) / 1e6
+    return JD_UNIX_EPOCH + seconds / 86400.0
+
+# ----------------------------
+# Batch engine
+# ----------------------------
+def _location_fields(location_obj):
+    # accepts geopy Location-like objects (latitude/longitude/address) or (lat, lon[, name]) tuples
+    if hasattr(location_obj, "latitude"):
+        name = getattr(location_obj, "address", "") or ""
+        return location_obj.latitude, location_obj.longitude, name.split(",")[0]
+    lat, lon = location_obj[0], location_obj[1]
+    name = location_obj[2] if len(location_obj) > 2 else ""
+    return lat, lon, name
+
+def _date_range(start_date, end_date):
+    n_days = (end_date - start_date).days + 1
+    if n_days <= 0:
+        raise ValueError("end_date must not be before start_date")
+    return [start_date + datetime.timedelta(days=i) for i in range(n_days)]
+
+def _planet_columns(prefix, ecl, ascendant, cols):
+    sign_no, deg_in_sign = deg_to_sign_vec(ecl)
+    nak_no, pada, deg_into_nak = calc_nakshatra_and_pada_vec(ecl)
+    house, deg_in_house = compute_house_vec(ecl, ascendant)
+    # days without a sunrise (polar day/night) have NaN longitudes -> 0 means "undefined"
+    missing = np.isnan(ecl)
+    for arr in (sign_no, nak_no, pada, house):
+        arr[missing] = 0
+    cols[prefix + "ecliptic_long"] = ecl
+    cols[prefix + "sign_no"] = sign_no
+    cols[prefix + "deg_in_sign"] = deg_in_sign
+    cols[prefix + "nakshatra_no"] = nak_no
+    cols[prefix + "pada"] = pada
+    cols[prefix + "deg_into_nak"] = deg_into_nak
+    cols[prefix + "house"] = house
+    cols[prefix + "deg_in_house"] = deg_in_house
+
+def _panchang_columns(lat, lon, tz_str, dates, jd_ut):
+    # ephemeris + vectorized mapping for one location, given the sunrise JDs (NaN = none)
+    n = len(dates)
+    valid = ~np.isnan(jd_ut)
+
+    # Sun/Moon from the precomputed Chebyshev cache when one is installed and covers the span
+    cache = get_ephemeris_cache()
+    use_cache = cache is not None and cache.covers(jd_ut)
+    if use_cache:
+        sun_ecl = cache.longitude("SUN", jd_ut)
+        moon_ecl = cache.longitude("MOON", jd_ut)
+    else:
+        sun_ecl = np.full(n, np.nan)
+        moon_ecl = np.full(n, np.nan)
+
+    # swisseph is scalar, so this is the only per-row loop left
+    ascendant = np.full(n, np.nan)
+    for i in np.flatnonzero(valid):
+        jd = jd_ut[i]
+        try:
+            ascendant[i] = swe.houses(jd, lat, lon, b'P')[1][0]  # Placidus
+        except swe.Error:
+            # Placidus is undefined inside the polar circles; the ascendant itself
+            # does not depend on the house system, so read it from equal houses
+            ascendant[i] = swe.houses(jd, lat, lon, b'E')[1][0]
+        if not use_cache:
+            sun_ecl[i] = swe.calc_ut(jd, swe.SUN)[0][0]
+            moon_ecl[i] = swe.calc_ut(jd, swe.MOON)[0][0]
+    ascendant = norm_vec(ascendant)
+    sun_ecl = norm_vec(sun_ecl)
+    moon_ecl = norm_vec(moon_ecl)
+
+    asc_sign_no, asc_deg_in_sign = deg_to_sign_vec(ascendant)
+    asc_sign_no[~valid] = 0
+
+    cols = {
+        "date": np.array(dates, dtype="datetime64[D]"),
+        "latitude": np.full(n, lat),
+        "longitude": np.full(n, lon),
+        "sunrise_utc": jd_to_datetime64(jd_ut),
+        "jd_ut": jd_ut,
+        "ascendant_deg": ascendant,
+        "asc_sign_no": asc_sign_no,
+        "asc_deg_in_sign": asc_deg_in_sign,
+    }
+    _planet_columns("sun_", sun_ecl, ascendant, cols)
+    _planet_columns("moon_", moon_ecl, ascendant, cols)
+    cols["timezone"] = tz_str  # scalar: same for every row of one location
+    return cols
+
+def compute_panchang_range(location_obj, start_date, end_date, tz_str=None):
+    """Sunrise panchang for every day in [start_date, end_date] at one location.
+
+    Returns a dict of equal-length NumPy arrays keyed by column name. Days on which the
+    sun does not rise have NaT/NaN values and 0 in the integer columns.
+    """
+    lat, lon, _ = _location_fields(location_obj)
+    lat = round(lat, 6)
+    lon = round(lon, 6)
+
+    # one-off setup (the per-day path in panchang_core.py repeats all of this)
+    if tz_str is None:
+        tz_str = get_timezone_resolver().timezone_name(lat, lon)
+    swe.set_ephe_path('.')
+
+    dates = _date_range(start_date, end_date)
+    # all sunrises in one vectorized call (polar day/night -> NaN), on local civil dates
+    offsets = zone_offsets(pytz.timezone(tz_str), dates)
+    jd_ut = sun_times(lat, lon, dates, utc_offsets=offsets)["sunrise"][0]
+    return _panchang_columns(lat, lon, tz_str, dates, jd_ut)
+
+def compute_panchang_many(locations, start_date, end_date):
+    """compute_panchang_range for several locations, concatenated row-wise.
+
+    Adds a "location_idx" column (position in `locations`) and expands
+    "timezone" to one entry per row.
+    """
+    fields = [_location_fields(loc) for loc in locations]
+    lats = np.round([f[0] for f in fields], 6)
+    lons = np.round([f[1] for f in fields], 6)
+    tz_names = get_timezone_resolver().timezone_names(lats, lons)
+    swe.set_ephe_path('.')
+
+    dates = _date_range(start_date, end_date)
+    # sunrise for the whole locations x dates grid at once, on local civil dates
+    zone_rows = {name: zone_offsets(pytz.timezone(name), dates) for name in set(tz_names)}
+    offsets = np.array([zone_rows[name] for name in tz_names])
+    sunrise_jd = sun_times(lats, lons, dates, utc_offsets=offsets)["sunrise"]
+    parts = []
+    for loc_idx in range(len(fields)):
+        cols = _panchang_columns(float(lats[loc_idx]), float(lons[loc_idx]), tz_names[loc_idx], dates, sunrise_jd[loc_idx])
+        n = len(dates)
+        cols["location_idx"] = np.full(n, loc_idx, dtype=np.int32)
+        cols["timezone"] = np.full(n, cols["timezone"], dtype=object)
+        parts.append(cols)
+    return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+def to_dataframe(cols):
+    # pandas is optional; names are added as categoricals so they cost one byte per row
+    import pandas as pd
+
+    df = pd.DataFrame({k: v for k, v in cols.items() if k != "timezone" or np.ndim(v)})
+    if np.ndim(cols.get("timezone")) == 0:
+        df["timezone"] = cols["timezone"]
+    # code -1 (from the 0 "undefined" marker) becomes NaN in a Categorical
+    df["asc_sign"] = pd.Categorical.from_codes(df["asc_sign_no"].astype(int) - 1, ZODIAC)
+    for prefix in ("sun_", "moon_"):
+        df[prefix + "sign"] = pd.Categorical.from_codes(df[prefix + "sign_no"].astype(int) - 1, ZODIAC)
+        df[prefix + "nakshatra"] = pd.Categorical.from_codes(df[prefix + "nakshatra_no"].astype(int) - 1, NAKSHATRA)
+    return df
@@ -0,0 +1,239 @@
+# panchang_cli.py
+# Headless batch mode: sunrise panchang rows for many places x date ranges,
+# computed on every CPU core and streamed to CSV or Parquet.
+#
+# Input CSV (header required), one place per row:
+#   place,country,lat,lon,start,end
+#   Chennai,India,,,2025-01-01,2034-12-31
+#   ,,51.5072,-0.1276,01-01-2025,31-12-2025
+# Either `place` (geocoded once, in the parent process) or `lat`/`lon` must be set;
+# `country` is optional. Dates are YYYY-MM-DD or DD-MM-YYYY (as in the UI).
+#
+#   python panchang_cli.py places.csv almanac.csv
+#   python panchang_cli.py places.csv almanac_parquet/ --format parquet --workers 16
+#   python panchang_cli.py places.csv almanac.csv --reference   # + lagna/rasi/nakshatra lords etc.
+#
+# Each input row is split into chunks of --chunk-days days. At most 2 x workers
+# chunks are in flight, so memory stays bounded whatever the span. Finished chunks
+# are recorded in a checkpoint next to the output; re-running the same command
+# after an interruption skips them (CSV output is truncated back to the last
+# complete chunk first). Rows are written in completion order; sort on
+# (row, date) if order matters. Parquet output needs pyarrow installed.
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from geocoder import suggest_locations
+from panchang_batch import compute_panchang_range, to_dataframe
+from reference_data import annotate_panchang
+from tz_resolver import get_timezone_resolver
+
+DEFAULT_CHUNK_DAYS = 366
+
+# ----------------------------
+# Input
+# ----------------------------
+def parse_date(text):
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid date {text!r}. Use YYYY-MM-DD or DD-MM-YYYY.")
+
+def read_places(path):
+    # -> list of dicts: row, name, lat, lon, start, end
+    places = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row_no, row in enumerate(csv.DictReader(f)):
+            place = (row.get("place") or "").strip()
+            lat, lon = (row.get("lat") or "").strip(), (row.get("lon") or "").strip()
+            if lat and lon:
+                lat, lon = float(lat), float(lon)
+                name = place
+            elif place:
+                matches = suggest_locations(place, (row.get("country") or "").strip() or None, limit=1)
+                if not matches:
+                    raise ValueError(f"Row {row_no}: no location found for {place!r}")
+                lat, lon, name = matches[0].latitude, matches[0].longitude, matches[0].address
+            else:
+                raise ValueError(f"Row {row_no}: need either place or lat/lon")
+            places.append({
+                "row": row_no, "name": name, "lat": lat, "lon": lon,
+                "start": parse_date(row["start"]), "end": parse_date(row["end"]),
+            })
+    return places
+
+def make_tasks(places, chunk_days):
+    # deterministic ids, so a re-run over the same input lines up with the checkpoint
+    resolver = get_timezone_resolver()
+    tz_names = resolver.timezone_names([p["lat"] for p in places], [p["lon"] for p in places])
+    tasks = []
+    for place, tz_str in zip(places, tz_names):
+        start = place["start"]
+        while start <= place["end"]:
+            end = min(start + datetime.timedelta(days=chunk_days - 1), place["end"])
+            tasks.append({
+                "id": f"{place['row']}:{start.isoformat()}",
+                "row": place["row"], "name": place["name"], "lat": place["lat"], "lon": place["lon"],
+                "tz": tz_str, "start": start, "end": end,
+            })
+            start = end + datetime.timedelta(days=1)
+    return tasks
+
+# ----------------------------
+# Worker
+# ----------------------------
+def run_task(task, reference=False):
+    # runs in a worker process; returns (task id, DataFrame)
+    cols = compute_panchang_range((task["lat"], task["lon"], task["name"].split(",")[0]),
+                                  task["start"], task["end"], tz_str=task["tz"])
+    df = to_dataframe(cols)
+    if reference:
+        annotate_panchang(df)
+    df.insert(0, "row", task["row"])
+    df.insert(1, "place", task["name"])
+    return task["id"], df
+
+# ----------------------------
+# Output + checkpoint
+# ----------------------------
+class Checkpoint:
+    # append-only JSON lines: {"id": ..., "offset": ...}; offset is the CSV size after the chunk
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last line from an interrupted write
+                    self.done[entry["id"]] = entry.get("offset")
+        self._f = open(path, "a", encoding="utf-8")
+
+    def last_offset(self):
+        offsets = [o for o in self.done.values() if o is not None]
+        return max(offsets) if offsets else 0
+
+    def record(self, task_id, offset=None):
+        self._f.write(json.dumps({"id": task_id, "offset": offset}) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self.done[task_id] = offset
+
+    def reset(self):
+        self._f.seek(0)
+        self._f.truncate()
+        self.done = {}
+
+    def close(self):
+        self._f.close()
+
+class CsvSink:
+    def __init__(self, path, checkpoint):
+        resume_at = checkpoint.last_offset()
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < resume_at:
+            # the CSV was deleted or replaced since the checkpoint: its chunks are gone, start over
+            checkpoint.reset()
+            resume_at = 0
+        self._f = open(path, "r+b" if os.path.exists(path) else "wb")
+        # drop anything written after the last recorded chunk
+        self._f.truncate(resume_at)
+        self._f.seek(resume_at)
+        self._header = resume_at == 0
+
+    def write(self, df):
+        data = df.to_csv(index=False, header=self._header).encode("utf-8")
+        self._header = False
+        self._f.write(data)
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def close(self):
+        self._f.close()
+
+class ParquetSink:
+    # one file per chunk, written to a temp name and renamed: a part either exists whole or not at all
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, df, task_id):
+        name = "part-" + task_id.replace(":", "_") + ".parquet"
+        tmp = os.path.join(self.out_dir, "." + name + ".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(self.out_dir, name))
+        return None
+
+    def close(self):
+        pass
+
+def run_batch(input_path, output_path, fmt="csv", workers=None, chunk_days=DEFAULT_CHUNK_DAYS, log=sys.stderr,
+              reference=False):
+    places = read_places(input_path)
+    tasks = make_tasks(places, chunk_days)
+    checkpoint_path = (os.path.join(output_path, "_checkpoint.jsonl") if fmt == "parquet"
+                       else output_path + ".checkpoint.jsonl")
+    if fmt == "parquet":
+        os.makedirs(output_path, exist_ok=True)
+    checkpoint = Checkpoint(checkpoint_path)
+    sink = ParquetSink(output_path) if fmt == "parquet" else CsvSink(output_path, checkpoint)
+    pending = iter([t for t in tasks if t["id"] not in checkpoint.done])
+    n_todo = len(tasks) - len(checkpoint.done)
+    workers = workers or os.cpu_count() or 1
+    n_done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            while True:
+                # keep at most 2 chunks per worker queued, so memory stays bounded
+                while len(in_flight) < 2 * workers:
+                    task = next(pending, None)
+                    if task is None:
+                        break
+                    in_flight.add(pool.submit(run_task, task, reference))
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task_id, df = future.result()
+                    if fmt == "parquet":
+                        sink.write(df, task_id)
+                        checkpoint.record(task_id)
+                    else:
+                        checkpoint.record(task_id, sink.write(df))
+                    n_done += 1
+                    print(f"[{n_done}/{n_todo}] {task_id}: {len(df)} rows", file=log)
+    finally:
+        sink.close()
+        checkpoint.close()
+    return n_done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch sunrise panchang over places x date ranges")
+    parser.add_argument("input", help="CSV with place,country,lat,lon,start,end columns")
+    parser.add_argument("output", help="output .csv file, or directory for --format parquet")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="default: parquet if output ends in .parquet or /, else csv")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--chunk-days", type=int, default=DEFAULT_CHUNK_DAYS)
+    parser.add_argument("--reference", action="store_true",
+                        help="add reference_data columns (lords, element, quality, ...)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("parquet" if args.output.endswith((".parquet", "/")) else "csv")
+    n = run_batch(args.input, args.output, fmt, args.workers, args.chunk_days,
+                  reference=args.reference)
+    print(f"Wrote {n} chunks to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
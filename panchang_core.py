@@ -0,0 +1,182 @@
+# panchang_core.py
+# Calculation core of the panchang apps, with no Streamlit dependency, so it can be
+# imported by batch workers, services and scripts. panchang.py is the UI on top.
+from tz_resolver import get_timezone_resolver
+import timing
+from astral import LocationInfo
+from astral.sun import sunrise, sunset
+import pytz
+import swisseph as swe  # pyswisseph
+
+class PanchangError(Exception):
+    """Raised when positions cannot be computed for a location/date."""
+
+# ----------------------------
+# Astronomy helpers (swisseph)
+# ----------------------------
+# Zodiac & Nakshatra names
+ZODIAC = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"]
+NAKSHATRA = [
+    "Ashwini","Bharani","Krittika","Rohini","Mrigashira","Ardra","Punarvasu",
+    "Pushya","Ashlesha","Magha","Purva Phalguni","Uttara Phalguni","Hasta",
+    "Chitra","Swati","Vishakha","Anuradha","Jyeshtha","Moola","Purva Ashadha",
+    "Uttara Ashadha","Shravana","Dhanishta","Shatabhisha","Purva Bhadrapada",
+    "Uttara Bhadrapada","Revati"
+]
+
+# Convert local time -> UTC julian day UT for swisseph
+def datetime_to_julday_utc(dt_local, tz):
+    # dt_local: naive or tz-aware local datetime
+    if dt_local.tzinfo is None:
+        local = tz.localize(dt_local)
+    else:
+        local = dt_local.astimezone(tz)
+    dt_utc = local.astimezone(pytz.utc)
+    year = dt_utc.year
+    month = dt_utc.month
+    day = dt_utc.day
+    hour = dt_utc.hour + dt_utc.minute/60.0 + dt_utc.second/3600.0 + dt_utc.microsecond/(3600.0*1e6)
+    jd = swe.julday(year, month, day, hour)
+    return jd
+
+# Normalize angle to 0-360
+def norm(angle):
+    a = angle % 360.0
+    if a < 0:
+        a += 360.0
+    return a
+
+def deg_to_sign(long_deg):
+    sign = int(long_deg // 30)  # 0..11
+    deg_in_sign = long_deg % 30
+    return ZODIAC[sign], sign+1, deg_in_sign  # sign name, sign number 1..12, degrees in sign
+
+def calc_nakshatra_and_pada(long_deg):
+    # total 360 deg divided into 27 nakshatras -> each 13 1/3 deg = 360/27
+    nak_size = 360.0 / 27.0  # 13.333...
+    pada_size = nak_size / 4.0  # 3.333...
+    idx = int(long_deg // nak_size)  # 0..26
+    nak = NAKSHATRA[idx]
+    deg_into_nak = long_deg - (idx * nak_size)
+    pada = int(deg_into_nak // pada_size) + 1  # 1..4
+    return idx+1, nak, pada, deg_into_nak  # nakshatra number (1..27), name, pada, degrees into nak
+
+def compute_house(planet_long, asc_long):
+    # Houses are 30-degree slices starting from ascendant
+    rel = (planet_long - asc_long) % 360.0
+    house = int(rel // 30.0) + 1  # house 1..12
+    deg_in_house = rel % 30.0
+    return house, deg_in_house
+
+# ----------------------------
+# Primary logic: sunrise + positions
+# ----------------------------
+def _place(location_obj):
+    # (lat, lon, tz_str, tz, astral observer) for a geocoded location
+    lat = round(location_obj.latitude, 6)
+    lon = round(location_obj.longitude, 6)
+
+    # shared, cached resolver (falls back to "UTC" where no zone is found)
+    with timing.stage("timezone"):
+        tz_str, tz = get_timezone_resolver().timezone(lat, lon)
+
+    city_short = location_obj.address.split(",")[0]
+    city = LocationInfo(city_short, "", tz_str, lat, lon)
+    return lat, lon, tz_str, tz, city.observer
+
+def fetch_sun_events(location_obj, date_obj):
+    """(sunrise, sunset) on date_obj as aware local datetimes; same path as fetch_sunrise_and_positions."""
+    try:
+        lat, lon, tz_str, tz, observer = _place(location_obj)
+        with timing.stage("sunrise"):
+            return sunrise(observer, date=date_obj, tzinfo=tz), sunset(observer, date=date_obj, tzinfo=tz)
+    except ValueError as e:
+        # no sunrise or no sunset that day (polar day/night)
+        raise PanchangError(str(e)) from e
+
+def fetch_sunrise_and_positions(location_obj, date_obj):
+    # each stage is timed when timing is enabled (see timing.py)
+    with timing.stage("fetch_sunrise_and_positions"):
+        return _fetch_sunrise_and_positions(location_obj, date_obj)
+
+def _fetch_sunrise_and_positions(location_obj, date_obj):
+    try:
+        lat, lon, tz_str, tz, observer = _place(location_obj)
+
+        # get sunrise time using astral
+        # (sunrise only: noon/dawn/dusk are not needed, and dawn/dusk fail in white nights)
+        with timing.stage("sunrise"):
+            sunrise_dt_local = sunrise(observer, date=date_obj, tzinfo=tz)  # timezone-aware
+
+        # convert to julian day UT for swisseph (needs UT)
+        jd_ut = datetime_to_julday_utc(sunrise_dt_local, tz)
+
+        # ensure ephemeris
+        # (optionally set a path: swe.set_ephe_path("/path/to/ephe") )
+        swe.set_ephe_path('.')  # current directory try; swisseph uses internal if not found
+
+        # Compute ascendant (house cusps)
+        # swe.houses(jd_ut, lat, lon, b'P') returns (cusps, ascmc) where ascmc[0] is ascendant
+        with timing.stage("houses"):
+            try:
+                cusps, ascmc = swe.houses(jd_ut, lat, lon, b'P')  # Placidus
+            except swe.Error:
+                # Placidus is undefined inside the polar circles; the ascendant does
+                # not depend on the house system, so read it from equal houses
+                # (as panchang_batch and chart do)
+                cusps, ascmc = swe.houses(jd_ut, lat, lon, b'E')
+        ascendant = norm(ascmc[0])  # degrees
+
+        # Planetary longitudes (ecliptic)
+        with timing.stage("calc_ut"):
+            sun_ecl = norm(swe.calc_ut(jd_ut, swe.SUN)[0][0])  # returns (lon, lat, dist)
+            moon_ecl = norm(swe.calc_ut(jd_ut, swe.MOON)[0][0])
+
+        # Sun details
+        sun_sign, sun_sign_no, sun_deg_in_sign = deg_to_sign(sun_ecl)
+        sun_nak_no, sun_nak_name, sun_pada, sun_deg_into_nak = calc_nakshatra_and_pada(sun_ecl)
+        sun_house, sun_deg_in_house = compute_house(sun_ecl, ascendant)
+
+        # Moon details
+        moon_sign, moon_sign_no, moon_deg_in_sign = deg_to_sign(moon_ecl)
+        moon_nak_no, moon_nak_name, moon_pada, moon_deg_into_nak = calc_nakshatra_and_pada(moon_ecl)
+        moon_house, moon_deg_in_house = compute_house(moon_ecl, ascendant)
+
+        out = {
+            "latitude": lat,
+            "longitude": lon,
+            "timezone": tz_str,
+            "sunrise_local": sunrise_dt_local,
+            "jd_ut": jd_ut,
+            "ascendant_deg": ascendant,
+            "sun": {
+                "ecliptic_long": sun_ecl,
+                "sign": sun_sign,
+                "sign_no": sun_sign_no,
+                "deg_in_sign": sun_deg_in_sign,
+                "nakshatra_no": sun_nak_no,
+                "nakshatra": sun_nak_name,
+                "pada": sun_pada,
+                "deg_into_nak": sun_deg_into_nak,
+                "house": sun_house,
+                "deg_in_house": sun_deg_in_house
+            },
+            "moon": {
+                "ecliptic_long": moon_ecl,
+                "sign": moon_sign,
+                "sign_no": moon_sign_no,
+                "deg_in_sign": moon_deg_in_sign,
+                "nakshatra_no": moon_nak_no,
+                "nakshatra": moon_nak_name,
+                "pada": moon_pada,
+                "deg_into_nak": moon_deg_into_nak,
+                "house": moon_house,
+                "deg_in_house": moon_deg_in_house
+            }
+        }
+
+        return out
+
+    except (swe.Error, ValueError) as e:
+        # ValueError: astral found no sunrise (polar day/night) or bad input
+        raise PanchangError(str(e)) from e
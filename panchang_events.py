@@ -0,0 +1,180 @@
+# panchang_events.py
+# Transition times instead of positions-at-sunrise: when the Moon enters each
+# nakshatra / pada / sign, when each tithi ends and when the Sun enters each sign
+# (sankranti).
+#
+# Every quantity here (Sun longitude, Moon longitude, Moon-Sun elongation) only
+# ever increases, so each crossing is found by predicting it from the current
+# speed reported by swisseph, then refining with Newton steps (bisection if a step
+# leaves the bracket). That is two or three ephemeris calls per event: a year of
+# all transitions takes a few thousand calls rather than minute-by-minute sampling.
+import datetime
+import heapq
+from collections import namedtuple
+import numpy as np
+import pytz
+import swisseph as swe  # pyswisseph
+
+from panchang_batch import ZODIAC, NAKSHATRA, NAK_SIZE, PADA_SIZE, JD_UNIX_EPOCH, datetimes_to_julday_utc
+
+TITHI_SIZE = 12.0  # degrees of Moon-Sun elongation per tithi
+SIGN_SIZE = 30.0
+
+_PAKSHA_TITHIS = [
+    "Pratipada","Dwitiya","Tritiya","Chaturthi","Panchami","Shashthi","Saptami",
+    "Ashtami","Navami","Dashami","Ekadashi","Dwadashi","Trayodashi","Chaturdashi"
+]
+# tithi 1..30: Shukla Pratipada .. Purnima, Krishna Pratipada .. Amavasya
+TITHI = (
+    ["Shukla " + t for t in _PAKSHA_TITHIS] + ["Purnima"]
+    + ["Krishna " + t for t in _PAKSHA_TITHIS] + ["Amavasya"]
+)
+
+EVENT_KINDS = ("nakshatra", "pada", "moon_sign", "tithi", "sankranti")
+
+# One transition: at jd_ut the quantity `kind` enters `number` (1-based) named `name`.
+# For "pada", number is the pada (1..4) and name is the nakshatra it belongs to.
+Event = namedtuple("Event", ["jd_ut", "kind", "number", "name"])
+
+DEFAULT_TOL_DAYS = 1e-6  # ~0.09 s
+MAX_ITER = 50
+
+def _wrap180(angle):
+    return (angle + 180.0) % 360.0 - 180.0
+
+def jd_to_datetime(jd_ut, tz=pytz.utc):
+    # inverse of datetime_to_julday_utc, returned as an aware datetime in `tz`
+    dt_utc = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc) + datetime.timedelta(days=jd_ut - JD_UNIX_EPOCH)
+    return dt_utc.astimezone(tz)
+
+class EventFinder:
+    def __init__(self, tol_days=DEFAULT_TOL_DAYS, flags=0):
+        self.tol_days = tol_days
+        self.flags = flags | swe.FLG_SPEED
+        self.calls = 0  # swisseph calls made so far
+        swe.set_ephe_path('.')
+
+    # ----------------------------
+    # Quantities: jd -> (angle 0..360, speed in deg/day)
+    # ----------------------------
+    def _body(self, jd, body):
+        self.calls += 1
+        xx = swe.calc_ut(jd, body, self.flags)[0]
+        return xx[0] % 360.0, xx[3]
+
+    def sun_longitude(self, jd):
+        return self._body(jd, swe.SUN)
+
+    def moon_longitude(self, jd):
+        return self._body(jd, swe.MOON)
+
+    def elongation(self, jd):
+        sun_lon, sun_speed = self._body(jd, swe.SUN)
+        moon_lon, moon_speed = self._body(jd, swe.MOON)
+        return (moon_lon - sun_lon) % 360.0, moon_speed - sun_speed
+
+    # ----------------------------
+    # Root finding
+    # ----------------------------
+    def _refine(self, fn, boundary, t_lo, t_guess):
+        # time in (t_lo, ...) where fn's angle reaches `boundary`; returns (jd, speed)
+        lo, hi = t_lo, None
+        t = t_guess
+        for _ in range(MAX_ITER):
+            angle, speed = fn(t)
+            diff = _wrap180(angle - boundary)  # < 0 before the crossing, > 0 after
+            if diff < 0:
+                lo = max(lo, t)
+            else:
+                hi = t if hi is None else min(hi, t)
+            step = -diff / speed
+            if abs(step) < self.tol_days:
+                return t + step, speed
+            t_next = t + step
+            if t_next <= lo or (hi is not None and t_next >= hi):
+                # Newton left the bracket: bisect, or push forward until bracketed
+                t_next = (lo + hi) / 2.0 if hi is not None else lo + 2.0 * max(t - lo, self.tol_days)
+            t = t_next
+            if hi is not None and hi - lo < self.tol_days:
+                return (lo + hi) / 2.0, speed
+        raise RuntimeError(f"crossing of {boundary} deg did not converge near JD {t_guess}")
+
+    def iter_crossings(self, fn, step, jd_start, jd_end):
+        """Yield (jd, segment_index) each time fn's angle enters a new `step`-sized segment."""
+        n_segments = int(round(360.0 / step))
+        angle, speed = fn(jd_start)
+        idx = int(angle // step) % n_segments
+        t = jd_start
+        while True:
+            idx = (idx + 1) % n_segments
+            boundary = idx * step
+            guess = t + ((boundary - angle) % 360.0) / speed
+            t, speed = self._refine(fn, boundary, t, guess)
+            if t > jd_end:
+                return
+            angle = boundary
+            yield t, idx
+
+    # ----------------------------
+    # Event streams
+    # ----------------------------
+    def _moon_events(self, jd_start, jd_end, kinds):
+        # nakshatra and sign boundaries are all pada boundaries (30 deg = 9 padas),
+        # so one pass over the coarsest step that covers the requested kinds is enough
+        if "pada" in kinds or ("nakshatra" in kinds and "moon_sign" in kinds):
+            step = PADA_SIZE
+        elif "nakshatra" in kinds:
+            step = NAK_SIZE
+        else:
+            step = SIGN_SIZE
+        per_nak = NAK_SIZE / step
+        per_sign = SIGN_SIZE / step
+        for jd, idx in self.iter_crossings(self.moon_longitude, step, jd_start, jd_end):
+            # segment idx starts at idx*step degrees; locate it in each division
+            if step == SIGN_SIZE:
+                yield Event(jd, "moon_sign", idx + 1, str(ZODIAC[idx]))
+                continue
+            nak_idx = int(idx // per_nak + 1e-9)
+            if "moon_sign" in kinds and abs(idx / per_sign - round(idx / per_sign)) < 1e-9:
+                sign_idx = int(round(idx / per_sign)) % 12
+                yield Event(jd, "moon_sign", sign_idx + 1, str(ZODIAC[sign_idx]))
+            if "nakshatra" in kinds and abs(idx / per_nak - round(idx / per_nak)) < 1e-9:
+                yield Event(jd, "nakshatra", nak_idx + 1, str(NAKSHATRA[nak_idx]))
+            if "pada" in kinds:
+                yield Event(jd, "pada", idx % 4 + 1, str(NAKSHATRA[nak_idx]))
+
+    def _tithi_events(self, jd_start, jd_end):
+        for jd, idx in self.iter_crossings(self.elongation, TITHI_SIZE, jd_start, jd_end):
+            yield Event(jd, "tithi", idx + 1, TITHI[idx])
+
+    def _sankranti_events(self, jd_start, jd_end):
+        for jd, idx in self.iter_crossings(self.sun_longitude, SIGN_SIZE, jd_start, jd_end):
+            yield Event(jd, "sankranti", idx + 1, str(ZODIAC[idx]))
+
+    def iter_events(self, jd_start, jd_end, kinds=EVENT_KINDS):
+        """Stream events in [jd_start, jd_end] in time order (lazily; any span)."""
+        kinds = set(kinds)
+        unknown = kinds - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown event kinds: {sorted(unknown)}")
+        streams = []
+        if kinds & {"nakshatra", "pada", "moon_sign"}:
+            streams.append(self._moon_events(jd_start, jd_end, kinds))
+        if "tithi" in kinds:
+            streams.append(self._tithi_events(jd_start, jd_end))
+        if "sankranti" in kinds:
+            streams.append(self._sankranti_events(jd_start, jd_end))
+        return heapq.merge(*streams, key=lambda e: e.jd_ut)
+
+def find_events(start_dt, end_dt, kinds=EVENT_KINDS, tz=None):
+    """All events between two aware datetimes, as dicts with local times in `tz`."""
+    tz = tz or start_dt.tzinfo or pytz.utc
+    jd_start, jd_end = (float(jd) for jd in datetimes_to_julday_utc(np.array([
+        start_dt.astimezone(pytz.utc).replace(tzinfo=None),
+        end_dt.astimezone(pytz.utc).replace(tzinfo=None),
+    ], dtype="datetime64[us]")))
+    finder = EventFinder()
+    return [
+        {"time_local": jd_to_datetime(e.jd_ut, tz), "jd_ut": e.jd_ut, "kind": e.kind, "number": e.number, "name": e.name}
+        for e in finder.iter_events(jd_start, jd_end, kinds)
+    ]
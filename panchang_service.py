@@ -0,0 +1,288 @@
+# panchang_service.py
+# Asyncio HTTP API around panchang_core.fetch_sunrise_and_positions (stdlib only).
+#
+#   python panchang_service.py --port 8080 [--processes 4]
+#
+#   GET  /panchang?lat=13.0827&lon=80.2707&date=2025-01-14[&name=Chennai]
+#   POST /panchang/batch   {"requests": [{"lat": .., "lon": .., "date": "YYYY-MM-DD"}, ...]}
+#   GET  /stats            cache / coalescing / timezone-resolver counters, stage timings
+#   GET  /metrics          stage timings in Prometheus text format (PANCHANG_TIMING=1)
+#   GET  /healthz
+#
+# swisseph keeps global state (ephemeris path, sidereal mode, open files), so
+# computations run in a bounded executor: one worker thread by default, or a pool
+# of worker processes (each with its own swisseph) with --processes. Identical
+# in-flight (location, date) requests share one computation, and finished results
+# are kept in a TTL + LRU cache. In process mode each worker sends its stage spans
+# and timezone-resolver counters back with every result, so /stats and /metrics
+# cover the work done in the workers.
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import panchang_core
+import timing
+from geocoder import Place
+from result_cache import TTLCache
+from tz_resolver import get_timezone_resolver
+
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_TTL = 3600.0  # seconds
+MAX_BATCH = 1000
+MAX_BODY_BYTES = 1024 * 1024
+COORD_DECIMALS = 4  # ~11 m; requests closer than that share a result
+
+class BadRequest(Exception):
+    pass
+
+# ----------------------------
+# Computation (runs in the executor)
+# ----------------------------
+def compute(lat, lon, date_iso, name=""):
+    # JSON-ready result for one (location, date)
+    date_obj = datetime.date.fromisoformat(date_iso)
+    out = panchang_core.fetch_sunrise_and_positions(Place(lat, lon, name or "Location"), date_obj)
+    out["sunrise_local"] = out["sunrise_local"].isoformat()
+    out["date"] = date_iso
+    return out
+
+def compute_in_worker(lat, lon, date_iso, name=""):
+    # process-pool entry -> (result, PanchangError or None, stage spans, pid, resolver stats)
+    result = error = None
+    with timing.trace() as spans:
+        try:
+            result = compute(lat, lon, date_iso, name)
+        except panchang_core.PanchangError as e:
+            error = e
+    return result, error, spans, os.getpid(), get_timezone_resolver().stats()
+
+class PanchangService:
+    def __init__(self, processes=0, cache_size=DEFAULT_CACHE_SIZE, cache_ttl=DEFAULT_CACHE_TTL):
+        self.processes = processes
+        if processes:
+            self.executor = ProcessPoolExecutor(max_workers=processes)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="swisseph")
+        self._worker_tz_stats = {}  # pid -> latest resolver stats of that worker
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self._in_flight = {}
+        self.computed = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _key(lat, lon, date_iso):
+        return (round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), date_iso)
+
+    async def get(self, lat, lon, date_iso, name=""):
+        key = self._key(lat, lon, date_iso)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[key] = future
+        try:
+            if self.processes:
+                result = await self._compute_in_worker(loop, key[0], key[1], date_iso, name)
+            else:
+                result = await loop.run_in_executor(self.executor, compute, key[0], key[1], date_iso, name)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved, in case nobody else was waiting
+            raise
+        else:
+            self.computed += 1
+            self.cache.put(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _compute_in_worker(self, loop, lat, lon, date_iso, name):
+        result, error, spans, pid, tz_stats = await loop.run_in_executor(
+            self.executor, compute_in_worker, lat, lon, date_iso, name)
+        for stage_name, seconds in spans:
+            timing.record(stage_name, seconds)
+        self._worker_tz_stats[pid] = tz_stats
+        if error is not None:
+            raise error
+        return result
+
+    def _timezone_stats(self):
+        if not self.processes:
+            return get_timezone_resolver().stats()
+        # summed over the workers' resolvers (as of each worker's latest result)
+        total = {"hits": 0, "misses": 0, "border_lookups": 0, "entries": 0}
+        for worker in self._worker_tz_stats.values():
+            for name in total:
+                total[name] += worker[name]
+        lookups = total["hits"] + total["misses"]
+        total["hit_rate"] = total["hits"] / lookups if lookups else 0.0
+        total["workers"] = len(self._worker_tz_stats)
+        return total
+
+    def stats(self):
+        total = self.cache.hits + self.cache.misses
+        return {
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cache_hit_rate": self.cache.hits / total if total else 0.0,
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "timezone": self._timezone_stats(),
+            "timing": timing.snapshot(),
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# ----------------------------
+# Request parsing
+# ----------------------------
+def _parse_item(item):
+    try:
+        lat = float(item["lat"])
+        lon = float(item["lon"])
+        date_iso = datetime.date.fromisoformat(str(item["date"])).isoformat()
+    except (KeyError, TypeError, ValueError) as e:
+        raise BadRequest(f"need lat, lon and date (YYYY-MM-DD): {e}")
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        raise BadRequest("lat/lon out of range")
+    return lat, lon, date_iso, str(item.get("name", ""))
+
+async def _one(service, item):
+    # batch entry: errors are reported per item instead of failing the whole batch
+    try:
+        return await service.get(*item)
+    except panchang_core.PanchangError as e:
+        return {"error": str(e)}
+
+async def handle(service, method, target, body):
+    """Route one request -> (status, payload); str payloads are sent as plain text."""
+    url = urlsplit(target)
+    try:
+        if method == "GET" and url.path == "/panchang":
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            return 200, await service.get(*_parse_item(params))
+        if method == "POST" and url.path == "/panchang/batch":
+            try:
+                items = json.loads(body or b"{}")["requests"]
+            except (ValueError, KeyError, TypeError):
+                raise BadRequest('body must be {"requests": [...]}')
+            if not isinstance(items, list) or len(items) > MAX_BATCH:
+                raise BadRequest(f"requests must be a list of at most {MAX_BATCH} items")
+            parsed = [_parse_item(item) for item in items]
+            results = await asyncio.gather(*(_one(service, item) for item in parsed))
+            return 200, {"results": results}
+        if method == "GET" and url.path == "/stats":
+            return 200, service.stats()
+        if method == "GET" and url.path == "/metrics":
+            return 200, timing.prometheus_text()
+        if method == "GET" and url.path == "/healthz":
+            return 200, {"ok": True}
+        return 404, {"error": "not found"}
+    except BadRequest as e:
+        return 400, {"error": str(e)}
+    except panchang_core.PanchangError as e:
+        return 422, {"error": str(e)}
+
+# ----------------------------
+# Minimal HTTP/1.1 server (keep-alive, Content-Length bodies)
+# ----------------------------
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+            422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+async def _serve_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                # the body cannot be framed, so the connection cannot be reused either
+                status, payload = 400, {"error": "invalid Content-Length"}
+                keep_alive = False
+            elif length > MAX_BODY_BYTES:
+                status, payload = 413, {"error": "body too large"}
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = await handle(service, method, target, body)
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            if isinstance(payload, str):
+                data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+        # client went away, or the server is shutting down with the connection open
+        pass
+    finally:
+        writer.close()
+
+async def start_server(service, host="127.0.0.1", port=8080):
+    return await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port, backlog=1024)
+
+async def _main_async(args):
+    service = PanchangService(args.processes, args.cache_size, args.cache_ttl)
+    server = await start_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Panchang HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--processes", type=int, default=0,
+                        help="worker processes for swisseph (default: one worker thread)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main_async(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
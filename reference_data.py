@@ -0,0 +1,216 @@
+# reference_data.py
+# Static rasi / lagna / nakshatra reference data, stored once per process as
+# integer-coded categorical arrays indexed by the sign and nakshatra numbers the
+# rest of the code computes (sign_no 1..12, nakshatra_no 1..27).
+#
+# Each field is (label, categories, codes): `codes` is an int8 array with one
+# entry per sign/nakshatra, so joining a field onto any number of rows is one
+# NumPy take, and the result is a pandas Categorical that shares `categories`
+# (one byte per row, no strings copied). 0 and other out-of-range numbers -- the
+# "undefined" marker of panchang_batch -- come out as code -1 (NaN).
+#
+# Planet-valued fields (lords, badhaka, ...) all use PLANETS, which is in
+# chart.GRAHAS order, so their codes are graha indices into a Chart/ChartBatch.
+#
+#   df = reference_data.annotate_panchang(to_dataframe(compute_panchang_range(...)))
+#   reference_data.annotate(df, "moon_nakshatra_no", "nakshatra", ["lord"])
+#   d = batch.derived()                                  # ChartBatch, (n, 9) arrays
+#   dispositor = reference_data.codes("rasi", "lord", d["sign_no"])  # (n, 9) graha indices
+#
+#   python reference_data.py --table lagna
+#   python reference_data.py --bench 1000000
+import argparse
+import sys
+import time
+
+import numpy as np
+
+# Tamil names, in chart.GRAHAS order (Sun .. Saturn, Rahu, Ketu)
+PLANETS = ("சூரியன்", "சந்திரன்", "செவ்வாய்", "புதன்", "குரு", "சுக்கிரன்", "சனி", "ராகு", "கேது")
+SUN, MOON, MARS, MERCURY, JUPITER, VENUS, SATURN, RAHU, KETU = range(9)
+
+# ----------------------------
+# Building the tables
+# ----------------------------
+def _field(label, values, categories=None):
+    # -> (label, categories, int8 codes); categories default to first-seen order
+    categories = tuple(categories or dict.fromkeys(values))
+    codes = np.array([categories.index(v) for v in values], dtype=np.int8)
+    codes.setflags(write=False)
+    return label, categories, codes
+
+def _planets(label, values):
+    return _field(label, [PLANETS[v] for v in values], PLANETS)
+
+RASI = {
+    "name": _field("ராசி", [
+        "மேஷம் (Aries)", "ரிஷபம் (Taurus)", "மிதுனம் (Gemini)", "கடகம் (Cancer)",
+        "சிம்மம் (Leo)", "கன்னி (Virgo)", "துலாம் (Libra)", "விருச்சிகம் (Scorpio)",
+        "தனுசு (Sagittarius)", "மகரம் (Capricorn)", "கும்பம் (Aquarius)", "மீனம் (Pisces)"]),
+    "lord": _planets("அதிபதி", [MARS, VENUS, MERCURY, MOON, SUN, MERCURY,
+                                 VENUS, MARS, JUPITER, SATURN, SATURN, JUPITER]),
+    "gender": _field("ஆண்/பெண்", ["ஆண்", "பெண்"] * 6),
+    "direction": _field("திசை", ["கிழக்கு", "தெற்கு", "மேற்கு", "வடக்கு"] * 3),
+    "element": _field("பஞ்சபூதம்", ["அக்கினி", "பூமி", "வாயு", "நீர்"] * 3),
+    "quality": _field("ராசி வகை", ["சரம்", "ஸ்திரம்", "உபயம்"] * 4),
+    "parity": _field("படை", [
+        "ஒற்றைப் படை", "இரட்டைப் படை", "இரட்டைப் படை", "ஒற்றைப் படை", "ஒற்றைப் படை",
+        "இரட்டைப் படை", "இரட்டைப் படை", "ஒற்றைப் படை", "ஒற்றைப் படை",
+        "இரட்டைப் படை", "ஒற்றைப் படை", "இரட்டைப் படை"]),
+    "guna": _field("குணம்", [
+        "ரஜசம்", "தாமசம்", "ரஜசம்", "சாத்த்விகம்", "சாத்த்விகம்",
+        "தாமசம்", "ரஜசம்", "தாமசம்", "சாத்த்விகம்", "தாமசம்", "தாமசம்", "சாத்த்விகம்"]),
+    "symbol": _field("சின்னம்", [
+        "ஆடு", "எருது", "இரட்டை", "நண்டு", "சிங்கம்", "கன்னி",
+        "தராசு", "விசிறி", "அம்பு", "முதலை", "குடம்", "மீன்"]),
+    "tamil_month": _field("தமிழ் மாதம்", [
+        "சித்திரை", "வைகாசி", "ஆனி", "ஆடி", "ஆவணி", "புரட்டாசி",
+        "ஐப்பசி", "கார்த்திகை", "மார்கழி", "தை", "மாசி", "பங்குனி"]),
+    "body_part": _field("உடல் பாகம்", [
+        "தலை", "முகம்", "கைகள்/தோள்", "மார்பு", "இதயம்", "வயிறு",
+        "இடுப்பு", "பாலியல் உறுப்புகள்", "தொடை", "முழங்கை", "கால்", "பாதம்"]),
+    "colour": _field("நிறம்", [
+        "சிவப்பு", "வெள்ளை", "பச்சை", "வெள்ளை", "செம்மஞ்சள்",
+        "பச்சை", "நீலம்", "சிகப்பு/கருப்பு", "மஞ்சள்", "கருப்பு", "நீலம்", "மஞ்சள்/வெள்ளை"]),
+}
+
+LAGNA = {
+    "name": ("லக்னம் (Lagna)",) + RASI["name"][1:],
+    "lord": ("லக்னாதிபதி (Lagna Lord)",) + RASI["lord"][1:],
+    "badhaka": _planets("பாதகாதிபதி (Badhaka)", [SATURN, JUPITER, MARS, VENUS, VENUS, MARS,
+                                                  JUPITER, SATURN, MARS, MOON, SUN, MERCURY]),
+    "roga": _planets("ரோகாதிபதி (Roga lord)", [MERCURY, VENUS, MARS, JUPITER, SATURN, SATURN,
+                                                JUPITER, MARS, VENUS, MERCURY, MOON, SUN]),
+    "vyaya": _planets("விரயாதிபதி (Vyaya lord)", [JUPITER, MARS, VENUS, MERCURY, MOON, SUN,
+                                                   MERCURY, VENUS, MARS, JUPITER, JUPITER, SATURN]),
+    # Cancer has two maraka lords, so this one is its own category set
+    "maraka": _field("மரகன் (Maraka lords)", [
+        "சுக்கிரன்", "புதன்", "சனி", "சூரியன், சனி", "புதன்", "சுக்கிரன்",
+        "செவ்வாய்", "சுக்கிரன்", "சனி", "சூரியன்", "சூரியன்", "சுக்கிரன்"]),
+    "critical_dasa": _planets("வர்குடத்த தசை (Critical Dasa)", [VENUS, MERCURY, SATURN, SATURN, MERCURY, VENUS,
+                                                                MARS, VENUS, SATURN, SUN, SUN, VENUS]),
+}
+
+NAKSHATRA = {
+    "name": _field("நட்சத்திரம்", [
+        "அசுவினி", "பரணி", "கார்த்திகை", "ரோகிணி", "மிருகசீரிடம்", "திருவாதிரை", "புனர்பூசம்",
+        "பூசம்", "ஆயில்யம்", "மகம்", "பூரம்", "உத்திரம்", "அஸ்தம்", "சித்திரை", "சுவாதி",
+        "விசாகம்", "அனுஷம்", "கேட்டை", "மூலம்", "பூராடம்", "உத்திராடம்", "திருவோணம்",
+        "அவிட்டம்", "சதயம்", "பூரட்டாதி", "உத்திரட்டாதி", "ரேவதி"]),
+    # Vimshottari dasa lord
+    "lord": _planets("அதிபதி", [KETU, VENUS, SUN, MOON, MARS, RAHU, JUPITER, SATURN, MERCURY] * 3),
+}
+
+TABLES = {"rasi": RASI, "lagna": LAGNA, "nakshatra": NAKSHATRA}
+
+# codes with a leading -1, so number n is at index n and 0 (undefined) maps to NaN
+_PADDED = {(table, name): np.concatenate(([-1], field[2])).astype(np.int8)
+           for table, fields in TABLES.items() for name, field in fields.items()}
+
+# ----------------------------
+# Joins
+# ----------------------------
+def _get(table, field):
+    try:
+        return TABLES[table][field]
+    except KeyError:
+        raise KeyError(f"Unknown reference field {table}.{field}") from None
+
+def _index(table, numbers):
+    # numbers -> positions into the padded code arrays (0 for anything out of range)
+    numbers = np.asarray(numbers)
+    if numbers.dtype.kind == "f":
+        numbers = np.nan_to_num(numbers)
+    idx = numbers.astype(np.intp, copy=False)
+    return np.where((idx >= 1) & (idx <= len(TABLES[table]["name"][2])), idx, 0)
+
+def codes(table, field, numbers, _idx=None):
+    """int8 category codes of `field` for 1-based sign/nakshatra `numbers` (any shape); -1 if out of range."""
+    _get(table, field)
+    return _PADDED[table, field][_index(table, numbers) if _idx is None else _idx]
+
+def categories(table, field):
+    return _get(table, field)[1]
+
+def lookup(table, field, numbers, _idx=None):
+    """pandas Categorical of `field` for a 1-D array of sign/nakshatra numbers."""
+    import pandas as pd
+
+    return pd.Categorical.from_codes(codes(table, field, numbers, _idx).ravel(), categories(table, field))
+
+def annotate(df, number_column, table, fields=None, prefix=None):
+    """Add reference fields to `df` (in place) by joining on `number_column`.
+
+    New columns are named prefix + field; the prefix defaults to the number
+    column without its "no" suffix ("asc_sign_no" -> "asc_sign_lord").
+    """
+    if prefix is None:
+        prefix = number_column[:-2] if number_column.endswith("_no") else number_column + "_"
+    numbers = df[number_column].to_numpy()
+    idx = _index(table, numbers)  # shared by all fields of this join
+    for field in fields or [f for f in TABLES[table] if f != "name"]:
+        df[prefix + field] = lookup(table, field, numbers, idx)
+    return df
+
+# what annotate_panchang adds to a panchang_batch.to_dataframe() frame
+PANCHANG_FIELDS = [
+    ("asc_sign_no", "lagna", None),
+    ("sun_sign_no", "rasi", ["lord", "element", "quality"]),
+    ("moon_sign_no", "rasi", ["lord", "element", "quality"]),
+    ("sun_nakshatra_no", "nakshatra", ["lord"]),
+    ("moon_nakshatra_no", "nakshatra", ["lord"]),
+]
+
+def annotate_panchang(df):
+    for number_column, table, fields in PANCHANG_FIELDS:
+        annotate(df, number_column, table, fields)
+    return df
+
+# ----------------------------
+# Display tables
+# ----------------------------
+_frames = {}
+
+def frame(table):
+    """The whole table as a DataFrame with the Tamil labels as columns, built once.
+
+    The same object is returned on every call; copy it before modifying.
+    """
+    df = _frames.get(table)
+    if df is None:
+        import pandas as pd
+
+        fields = TABLES[table]
+        df = pd.DataFrame({label: pd.Categorical.from_codes(c, cats) for label, cats, c in fields.values()},
+                          index=pd.RangeIndex(1, len(fields["name"][2]) + 1, name="no"))
+        _frames[table] = df
+    return df
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rasi / lagna / nakshatra reference tables")
+    parser.add_argument("--table", choices=list(TABLES), default=None, help="print one table")
+    parser.add_argument("--bench", type=int, default=0, metavar="ROWS",
+                        help="time annotate_panchang on ROWS random rows")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        import pandas as pd
+
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({col: rng.integers(0, 28 if "nakshatra" in col else 13, args.bench)
+                           for col, _, _ in PANCHANG_FIELDS})
+        before = df.memory_usage(deep=True).sum()
+        t0 = time.perf_counter()
+        annotate_panchang(df)
+        elapsed = time.perf_counter() - t0
+        added = df.memory_usage(deep=True).sum() - before
+        print(f"annotate_panchang: {args.bench} rows, {df.shape[1] - len(PANCHANG_FIELDS)} columns "
+              f"in {elapsed * 1000:.1f} ms, +{added / 1e6:.1f} MB")
+        return 0
+    for table in [args.table] if args.table else TABLES:
+        print(frame(table).to_string())
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
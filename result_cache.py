@@ -0,0 +1,141 @@
+# result_cache.py
+# Result caches shared by the Streamlit apps and the HTTP service.
+#
+# Streamlit re-executes the app script on every widget change, but imported modules
+# stay loaded, so caches kept here live for the whole server process and are shared
+# by all sessions. On top of that each session keeps its own small cache in
+# st.session_state, so a user's recent places and charts stay hot even when other
+# sessions churn the process cache.
+#
+#   suggestions: keyed on (normalized query, country, limit)
+#   charts:      keyed on (kind, lat, lon, date)
+#
+# Both evict by size (LRU) and age (TTL). Errors are never cached.
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from geocoder import normalize_name
+
+SUGGESTION_CACHE_SIZE = int(os.environ.get("PANCHANG_SUGGESTION_CACHE_SIZE", "2048"))
+SUGGESTION_CACHE_TTL = float(os.environ.get("PANCHANG_SUGGESTION_CACHE_TTL", "86400"))  # places don't move
+CHART_CACHE_SIZE = int(os.environ.get("PANCHANG_CHART_CACHE_SIZE", "10000"))
+CHART_CACHE_TTL = float(os.environ.get("PANCHANG_CHART_CACHE_TTL", "3600"))
+SESSION_CACHE_SIZE = 64
+DEBOUNCE_SECONDS = 0.4
+COORD_DECIMALS = 6  # same rounding as fetch_sunrise_and_positions
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire `ttl` seconds after insertion."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0}
+
+    def __len__(self):
+        return len(self._data)
+
+class SessionCache(TTLCache):
+    # per-session cache stored in a mapping such as st.session_state (survives reruns)
+    @classmethod
+    def of(cls, state, name, max_entries=SESSION_CACHE_SIZE, ttl=CHART_CACHE_TTL):
+        cache = state.get(name)
+        if cache is None:
+            cache = state[name] = cls(max_entries, ttl)
+        return cache
+
+_suggestions = TTLCache(SUGGESTION_CACHE_SIZE, SUGGESTION_CACHE_TTL)
+_charts = TTLCache(CHART_CACHE_SIZE, CHART_CACHE_TTL)
+
+def suggestion_key(query, country_hint=None, limit=6):
+    return (normalize_name(query), country_hint or "", limit)
+
+def chart_key(kind, lat, lon, date_obj):
+    return (kind, round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), date_obj.isoformat())
+
+def _cached(key, compute, process_cache, session_cache=None):
+    # session cache first, then the process cache, then compute (and fill both)
+    if session_cache is not None:
+        value = session_cache.get(key)
+        if value is not None:
+            return value
+    value = process_cache.get(key)
+    if value is None:
+        value = compute()
+        process_cache.put(key, value)
+    if session_cache is not None:
+        session_cache.put(key, value)
+    return value
+
+def cached_suggestions(query, country_hint, limit, lookup, session_cache=None, before_lookup=None):
+    """lookup(query, country_hint, limit) through the caches.
+
+    before_lookup() runs only on a cache miss, right before the (possibly remote)
+    lookup; the apps use it to debounce.
+    """
+    def compute():
+        if before_lookup is not None:
+            before_lookup()
+        return list(lookup(query, country_hint, limit))
+    return _cached(suggestion_key(query, country_hint, limit), compute, _suggestions, session_cache)
+
+def cached_chart(kind, location_obj, date_obj, compute_fn, session_cache=None):
+    """compute_fn(location_obj, date_obj) through the caches, keyed on (kind, lat, lon, date)."""
+    key = chart_key(kind, location_obj.latitude, location_obj.longitude, date_obj)
+    return _cached(key, lambda: compute_fn(location_obj, date_obj), _charts, session_cache)
+
+def debounce(state, name, value, seconds=DEBOUNCE_SECONDS):
+    """Wait out the rest of `seconds` if `value` changed less than `seconds` ago.
+
+    Returns True if it waited. In Streamlit a newer keystroke stops the running
+    script at its next st.* call, so the caller should make one after waiting and
+    before the expensive call; a superseded query then never reaches the backend.
+    """
+    now = time.monotonic()
+    last_value, last_time = state.get(name, (None, 0.0))
+    state[name] = (value, now)
+    if value != last_value and now - last_time < seconds:
+        time.sleep(seconds - (now - last_time))
+        return True
+    return False
+
+def stats():
+    return {"suggestions": _suggestions.stats(), "charts": _charts.stats()}
+
+def clear():
+    _suggestions.clear()
+    _charts.clear()
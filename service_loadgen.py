@@ -0,0 +1,159 @@
+# service_loadgen.py
+# Local load generator for panchang_service.py: p50/p99 latency and throughput
+# at several concurrency levels.
+#
+#   python service_loadgen.py                       # starts an in-process server
+#   python service_loadgen.py --url http://127.0.0.1:8080 --concurrency 1 16 64
+#
+# Each level runs `--requests` GETs over keep-alive connections, drawing
+# (location, date) keys from a pool of `--distinct` keys, so the cache and
+# request coalescing see a mix of repeats; the service's cache hit rate for the
+# level is printed next to the latencies. With --cold every request (across all
+# levels) uses a key never asked before, so the latencies are those of real
+# computations. Use --batch N to send POST /panchang/batch requests of N items.
+#
+#   python service_loadgen.py --cold --requests 500
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+CITIES = [
+    (13.0827, 80.2707), (19.0760, 72.8777), (28.6139, 77.2090), (12.9716, 77.5946),
+    (51.5072, -0.1276), (40.7128, -74.0060), (1.3521, 103.8198), (25.2048, 55.2708),
+    (-33.8688, 151.2093), (43.6532, -79.3832), (52.5200, 13.4050), (48.8566, 2.3522),
+]
+
+def make_keys(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime.date(2025, 1, 1)
+    return [(*rng.choice(CITIES), (start + datetime.timedelta(days=rng.randrange(3650))).isoformat())
+            for _ in range(n)]
+
+def make_unique_keys(n, seed=0):
+    # n distinct keys: every city x date once, nudged by 0.001 deg per further round
+    rng = random.Random(seed)
+    start = datetime.date(2025, 1, 1)
+    combos = [(city, day) for city in CITIES for day in range(3650)]
+    rng.shuffle(combos)
+    keys = []
+    for i in range(n):
+        (lat, lon), day = combos[i % len(combos)]
+        keys.append((round(lat + 0.001 * (i // len(combos)), 4), lon,
+                     (start + datetime.timedelta(days=day)).isoformat()))
+    return keys
+
+async def _request(reader, writer, host, method, path, body=b""):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def _cache_counts(host, port):
+    # (hits, misses) of the service's result cache, from GET /stats
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await _request(reader, writer, host, "GET", "/stats")
+    finally:
+        writer.close()
+    stats = json.loads(body)
+    return stats["cache_hits"], stats["cache_misses"]
+
+async def run_level(host, port, concurrency, n_requests, draw, batch=0):
+    # draw() -> next (lat, lon, date) key
+    latencies = []
+    errors = 0
+    queue = iter(range(n_requests))
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in queue:
+                if batch:
+                    items = [{"lat": k[0], "lon": k[1], "date": k[2]} for k in (draw() for _ in range(batch))]
+                    args = ("POST", "/panchang/batch", json.dumps({"requests": items}).encode("utf-8"))
+                else:
+                    lat, lon, date_iso = draw()
+                    args = ("GET", f"/panchang?lat={lat}&lon={lon}&date={date_iso}")
+                t0 = time.perf_counter()
+                status, _ = await _request(reader, writer, host, *args)
+                latencies.append(time.perf_counter() - t0)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    hits0, misses0 = await _cache_counts(host, port)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    hits1, misses1 = await _cache_counts(host, port)
+    lookups = (hits1 - hits0) + (misses1 - misses0)
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000.0
+    return {"concurrency": concurrency, "requests": len(latencies), "errors": errors,
+            "p50_ms": pct(0.50), "p99_ms": pct(0.99), "throughput_rps": len(latencies) / elapsed,
+            "cache_hit_rate": (hits1 - hits0) / lookups if lookups else 0.0}
+
+async def _main_async(args):
+    server = service = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        from panchang_service import PanchangService, start_server
+        service = PanchangService(processes=args.processes)
+        server = await start_server(service, "127.0.0.1", 0)
+        host, port = "127.0.0.1", server.sockets[0].getsockname()[1]
+    if args.cold:
+        per_request = max(args.batch, 1)
+        draw = iter(make_unique_keys(len(args.concurrency) * args.requests * per_request)).__next__
+    else:
+        keys = make_keys(args.distinct)
+        draw = lambda rng=random.Random(0): rng.choice(keys)
+    print(f"{'conc':>5} {'reqs':>7} {'err':>4} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9} {'hit %':>6}")
+    try:
+        for level in args.concurrency:
+            r = await run_level(host, port, level, args.requests, draw, args.batch)
+            print(f"{r['concurrency']:>5} {r['requests']:>7} {r['errors']:>4} "
+                  f"{r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['throughput_rps']:>9.1f} "
+                  f"{r['cache_hit_rate'] * 100:>6.1f}")
+        if service is not None:
+            print(json.dumps(service.stats(), indent=2))
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for panchang_service.py")
+    parser.add_argument("--url", help="running service to target (default: start one in-process)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument("--distinct", type=int, default=500, help="distinct (location, date) keys")
+    parser.add_argument("--cold", action="store_true",
+                        help="every request uses a new key (no cache hits); ignores --distinct")
+    parser.add_argument("--batch", type=int, default=0, help="items per POST /panchang/batch (0 = GET)")
+    parser.add_argument("--processes", type=int, default=0, help="worker processes for the in-process server")
+    args = parser.parse_args(argv)
+    asyncio.run(_main_async(args))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
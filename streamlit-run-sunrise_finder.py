@@ -1,56 +1,63 @@
 import streamlit as st
 import requests
 import datetime
-from geopy.geocoders import Nominatim
+from geocoder import suggest_locations
 from astral import LocationInfo
 from astral.sun import sun
-from timezonefinder import TimezoneFinder
-import pytz
+from tz_resolver import get_timezone_resolver
+import result_cache
 
 # ---------------------------
 # Function to fetch multiple location suggestions
 # ---------------------------
+def _debounce_lookup(query):
+    # typing pause before a real lookup; a newer keystroke stops this run at the st call
+    if result_cache.debounce(st.session_state, "_geocode_debounce", query):
+        st.empty()
+
 def get_location_suggestions(query, country_hint=None):
-    geolocator = Nominatim(user_agent="hora_gui")
+    # cached per (query, country) for the session and the process
     try:
-        query_full = f"{query}, {country_hint}" if country_hint else query
-        locations = geolocator.geocode(query_full, exactly_one=False, limit=5, addressdetails=True)
-        return locations
+        return result_cache.cached_suggestions(
+            query, country_hint, 5, suggest_locations,
+            session_cache=result_cache.SessionCache.of(st.session_state, "_suggestion_cache"),
+            before_lookup=lambda: _debounce_lookup(query),
+        )
     except Exception:
         return []
 
 # ---------------------------
 # Function to fetch sunrise
 # ---------------------------
+def _compute_sunrise(location_obj, date_obj):
+    lat = round(location_obj.latitude, 6)
+    lon = round(location_obj.longitude, 6)
+
+    timezone_str, tz = get_timezone_resolver().timezone(lat, lon)
+
+    short_name = location_obj.address.split(",")[0]
+
+    city = LocationInfo(
+        short_name,
+        "",
+        timezone_str,
+        lat,
+        lon
+    )
+
+    s = sun(city.observer, date=date_obj, tzinfo=tz)
+    sunrise_time = s['sunrise'].strftime('%H:%M')
+
+    return lat, lon, sunrise_time
+
 def fetch_sunrise(location_obj, date_obj):
+    # cached per (lat, lon, date): flipping back to a date is instant
     try:
-        lat = round(location_obj.latitude, 6)
-        lon = round(location_obj.longitude, 6)
-
-        tz_finder = TimezoneFinder()
-        timezone_str = tz_finder.timezone_at(lng=lon, lat=lat)
-
-        if timezone_str:
-            tz = pytz.timezone(timezone_str)
-        else:
-            tz = pytz.utc
-            timezone_str = "UTC"
-
-        short_name = location_obj.address.split(",")[0]
-
-        city = LocationInfo(
-            short_name,
-            "",
-            timezone_str,
-            lat,
-            lon
+        lat, lon, sunrise_time = result_cache.cached_chart(
+            "sunrise", location_obj, date_obj, _compute_sunrise,
+            session_cache=result_cache.SessionCache.of(st.session_state, "_chart_cache"),
         )
-
-        s = sun(city.observer, date=date_obj, tzinfo=tz)
-        sunrise_time = s['sunrise'].strftime('%H:%M')
-
         return lat, lon, sunrise_time, location_obj.address
-
     except Exception as e:
         st.error(f"An error occurred: {e}")
         return None
@@ -0,0 +1,255 @@
+# sun_times.py
+# Vectorized sunrise / sunset / solar noon for a whole grid of locations x dates.
+#
+# Same NOAA solar equations and horizon definition as astral (upper limb, 16'
+# semi-diameter plus astral's refraction at the horizon), but evaluated with NumPy
+# over (n_locations, n_dates) arrays in one call, and without computing dawn/dusk.
+# Days with no sunrise are flagged instead of raising: status is POLAR_DAY (sun
+# always above the horizon) or POLAR_NIGHT (always below), and the rise/set
+# entries are NaN. Solar noon is always defined.
+#
+# Each day is the one centred on the solar noon nearest to that date's local
+# civil noon, given the zone's UTC offsets (zone_offsets). Without offsets the
+# solar day of the longitude is used, which is the civil date only where the
+# zone is within ~12 h of solar time -- not across the dateline bulge (Samoa,
+# Tonga, Kiribati Line Islands, Tokelau, Chatham), so pass offsets for civil dates.
+#
+# Cross-check against astral and swisseph rise_trans:
+#   python sun_times.py --check
+# Stated tolerances (checked for |latitude| <= 60): |kernel - astral| <= 1 s,
+# |kernel - swisseph| <= 2 min (NOAA low-precision series vs. full ephemeris).
+import argparse
+import datetime
+import sys
+import numpy as np
+
+JD_UNIX_EPOCH = 2440587.5
+JD_J2000 = 2451545.0
+
+SUN_APPARENT_RADIUS = 32.0 / (60.0 * 2.0)  # degrees
+
+NORMAL = 0
+POLAR_DAY = 1
+POLAR_NIGHT = -1
+
+ASTRAL_TOLERANCE_S = 1.0
+SWISSEPH_TOLERANCE_S = 120.0
+CHECK_MAX_LATITUDE = 60.0
+
+def _refraction_at_zenith(zenith):
+    # astral.refraction_at_zenith, for the -0.575 < elevation <= 5 branch used at the horizon
+    elevation = 90.0 - zenith
+    correction = 1735.0 + elevation * (-518.2 + elevation * (103.4 + elevation * (-12.79 + elevation * 0.711)))
+    return correction / 3600.0
+
+# zenith angle of the sun's centre at sunrise/sunset
+RISE_SET_ZENITH = 90.0 + SUN_APPARENT_RADIUS + _refraction_at_zenith(90.0 + SUN_APPARENT_RADIUS)
+
+# ----------------------------
+# Solar position (NOAA), array versions of astral.sun's helpers
+# ----------------------------
+def _solar_params(jd):
+    # -> (declination deg, equation of time minutes) at julian day(s) jd
+    jc = (jd - JD_J2000) / 36525.0
+    l0 = np.mod(280.46646 + jc * (36000.76983 + 0.0003032 * jc), 360.0)
+    m = 357.52911 + jc * (35999.05029 - 0.0001537 * jc)
+    e = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    mrad = np.radians(m)
+    c = (np.sin(mrad) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+         + np.sin(2.0 * mrad) * (0.019993 - 0.000101 * jc)
+         + np.sin(3.0 * mrad) * 0.000289)
+    omega = np.radians(125.04 - 1934.136 * jc)
+    apparent_long = l0 + c - 0.00569 - 0.00478 * np.sin(omega)
+    seconds = 21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))
+    obliquity = 23.0 + (26.0 + seconds / 60.0) / 60.0 + 0.00256 * np.cos(omega)
+    declination = np.degrees(np.arcsin(np.sin(np.radians(obliquity)) * np.sin(np.radians(apparent_long))))
+
+    y = np.tan(np.radians(obliquity) / 2.0) ** 2
+    l0rad = np.radians(l0)
+    eqtime = (y * np.sin(2.0 * l0rad) - 2.0 * e * np.sin(mrad)
+              + 4.0 * e * y * np.sin(mrad) * np.cos(2.0 * l0rad)
+              - 0.5 * y * y * np.sin(4.0 * l0rad) - 1.25 * e * e * np.sin(2.0 * mrad))
+    return declination, np.degrees(eqtime) * 4.0
+
+def _dates_to_jd0(dates):
+    # dates (datetime.date list / datetime64[D] array) -> JD at 0h UT
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    return JD_UNIX_EPOCH + days.astype(float)
+
+def zone_offsets(tz, dates):
+    """UTC offset (days) of zone `tz` (pytz or zoneinfo) at local noon of each date."""
+    transitions = getattr(tz, "_utc_transition_times", None)
+    if transitions is not None:
+        # pytz zones carry their transition table: one searchsorted instead of a
+        # localize() per date (~30 us each, i.e. 1 s per century of dates)
+        utc = np.array(transitions, dtype="datetime64[s]").astype(np.int64)
+        offsets = np.array([info[0].total_seconds() for info in tz._transition_info])
+        local_noon = (_dates_to_jd0(dates) - JD_UNIX_EPOCH) * 86400.0 + 43200.0
+        offset = np.full(local_noon.shape, offsets[0])
+        for _ in range(2):  # second pass: look up at local noon in UTC, not at UTC noon
+            idx = np.searchsorted(utc, local_noon - offset, side="right") - 1
+            offset = offsets[np.clip(idx, 0, len(offsets) - 1)]
+        return offset / 86400.0
+    localize = getattr(tz, "localize", lambda dt: dt.replace(tzinfo=tz))
+    noon = datetime.time(12)
+    return np.array([localize(datetime.datetime.combine(d, noon)).utcoffset().total_seconds()
+                     for d in dates]) / 86400.0
+
+def sun_times(lats, lons, dates, zenith=RISE_SET_ZENITH, iterations=3, utc_offsets=None):
+    """Sunrise, sunset and solar noon (JD UT) for every (location, date) pair.
+
+    lats/lons: scalars or 1-d arrays of length L; dates: sequence of D dates.
+    utc_offsets: zone offsets from UTC in days, scalar, (D,) or (L, D) (see
+    zone_offsets()); with them each date is the local civil date, without
+    them the local solar date.
+    Returns a dict of (L, D) arrays: "sunrise", "sunset", "noon" (julian day UT)
+    and "status" (NORMAL / POLAR_DAY / POLAR_NIGHT).
+    """
+    lat = np.clip(np.atleast_1d(np.asarray(lats, dtype=float)), -89.8, 89.8)[:, None]
+    lon = np.atleast_1d(np.asarray(lons, dtype=float))[:, None]
+    jd0 = _dates_to_jd0(dates)[None, :]
+    if utc_offsets is not None:
+        # shift to the UT date whose solar noon is nearest local civil noon
+        # (0 except where the zone is more than ~12 h off solar time)
+        jd0 = jd0 + np.round(lon / 360.0 - np.asarray(utc_offsets, dtype=float))
+    lat_rad = np.radians(lat)
+    cos_zenith = np.cos(np.radians(zenith))
+
+    def transit(direction):
+        # direction: -1 rising, +1 setting, 0 noon; refined at the event time itself
+        t = jd0 + 0.5 - lon / 360.0
+        cos_h = np.zeros(np.broadcast(t, lat).shape)
+        for _ in range(iterations):
+            decl, eqtime = _solar_params(t)
+            noon = jd0 + (720.0 - 4.0 * lon - eqtime) / 1440.0
+            if direction == 0:
+                t = noon
+                continue
+            decl_rad = np.radians(decl)
+            cos_h = (cos_zenith - np.sin(lat_rad) * np.sin(decl_rad)) / (np.cos(lat_rad) * np.cos(decl_rad))
+            hour_angle = np.degrees(np.arccos(np.clip(cos_h, -1.0, 1.0)))
+            t = noon + direction * hour_angle / 360.0
+        return t, cos_h
+
+    noon, _ = transit(0)
+    sunrise, cos_h_rise = transit(-1)
+    sunset, cos_h_set = transit(+1)
+
+    status = np.zeros(sunrise.shape, dtype=np.int8)
+    status[(cos_h_rise < -1.0) | (cos_h_set < -1.0)] = POLAR_DAY
+    status[(cos_h_rise > 1.0) | (cos_h_set > 1.0)] = POLAR_NIGHT
+    no_event = status != NORMAL
+    sunrise[no_event] = np.nan
+    sunset[no_event] = np.nan
+    return {"sunrise": sunrise, "sunset": sunset, "noon": np.broadcast_to(noon, sunrise.shape).copy(), "status": status}
+
+def jd_to_datetime64(jd):
+    # julian day UT array -> datetime64[us] (UTC); NaN -> NaT
+    jd = np.asarray(jd, dtype=float)
+    out = np.full(jd.shape, np.datetime64("NaT"), dtype="datetime64[us]")
+    ok = ~np.isnan(jd)
+    out[ok] = np.round((jd[ok] - JD_UNIX_EPOCH) * 86400e6).astype(np.int64).astype("datetime64[us]")
+    return out
+
+# ----------------------------
+# Cross-check against astral and swisseph
+# ----------------------------
+def cross_check(lats, lons, dates):
+    """Max |difference| in seconds vs. astral.sun.sunrise/sunset and swe.rise_trans.
+
+    Only pairs with a normal sunrise are compared; astral works on UTC dates, so
+    it is asked for the UTC dates around the kernel's event.
+    """
+    import pytz
+    import swisseph as swe
+    from astral import Observer
+    from astral.sun import sunrise as astral_sunrise, sunset as astral_sunset
+
+    res = sun_times(lats, lons, dates)
+    worst = {"astral": 0.0, "swisseph": 0.0, "astral_missing": 0}
+    for i, (lat, lon) in enumerate(zip(np.atleast_1d(lats), np.atleast_1d(lons))):
+        observer = Observer(float(lat), float(lon))
+        for j in range(len(dates)):
+            if res["status"][i, j] != NORMAL:
+                continue
+            for key, astral_fn, rsmi in (("sunrise", astral_sunrise, swe.CALC_RISE),
+                                         ("sunset", astral_sunset, swe.CALC_SET)):
+                jd = res[key][i, j]
+                # a UTC date can hold two sunsets (e.g. 00:01 and 23:58), so take the closest
+                utc_day = jd_to_datetime64(jd).astype("datetime64[D]").item()
+                diffs = []
+                for delta in (-1, 0, 1):
+                    try:
+                        ref = astral_fn(observer, date=utc_day + datetime.timedelta(days=delta), tzinfo=pytz.utc)
+                    except ValueError:
+                        continue
+                    diffs.append(abs(jd - (JD_UNIX_EPOCH + ref.timestamp() / 86400.0)) * 86400.0)
+                # astral's date juggling can skip an event right after 00:00 UTC; count those apart
+                if diffs and min(diffs) < 43200.0:
+                    worst["astral"] = max(worst["astral"], min(diffs))
+                else:
+                    worst["astral_missing"] += 1
+                _, tret = swe.rise_trans(jd - 0.25, swe.SUN, rsmi, (float(lon), float(lat), 0.0))
+                worst["swisseph"] = max(worst["swisseph"], abs(jd - tret[0]) * 86400.0)
+    return worst
+
+# places whose zone is ~12 h or more off solar time, plus ordinary controls
+DATELINE_PLACES = [
+    ("Apia", -13.8333, -171.7667, "Pacific/Apia"),
+    ("Nuku'alofa", -21.1394, -175.2049, "Pacific/Tongatapu"),
+    ("Kiritimati", 1.8721, -157.4278, "Pacific/Kiritimati"),
+    ("Fakaofo", -9.3803, -171.2188, "Pacific/Fakaofo"),
+    ("Chatham", -43.9535, -176.5597, "Pacific/Chatham"),
+    ("Honolulu", 21.3069, -157.8583, "Pacific/Honolulu"),
+    ("Chennai", 13.0827, 80.2707, "Asia/Kolkata"),
+]
+
+def civil_date_check(dates, places=DATELINE_PLACES):
+    """Sunrise per local civil date vs. astral (asked for that local date, as panchang_core is).
+
+    Returns (max |difference| s, number of rows whose sunrise falls on another local date).
+    """
+    import pytz
+    from astral import Observer
+    from astral.sun import sunrise as astral_sunrise
+
+    worst, wrong_date = 0.0, 0
+    for _, lat, lon, tz_name in places:
+        tz = pytz.timezone(tz_name)
+        rise = sun_times(lat, lon, dates, utc_offsets=zone_offsets(tz, dates))["sunrise"][0]
+        for date_obj, jd in zip(dates, rise):
+            ref = astral_sunrise(Observer(lat, lon), date=date_obj, tzinfo=tz)
+            local = datetime.datetime.fromtimestamp((jd - JD_UNIX_EPOCH) * 86400.0, tz)
+            wrong_date += local.date() != date_obj
+            worst = max(worst, abs(jd - (JD_UNIX_EPOCH + ref.timestamp() / 86400.0)) * 86400.0)
+    return worst, wrong_date
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorized sunrise/sunset kernel")
+    parser.add_argument("--check", action="store_true", help="cross-check against astral and swisseph")
+    parser.add_argument("--year", type=int, default=datetime.date.today().year)
+    args = parser.parse_args(argv)
+    if not args.check:
+        parser.print_help()
+        return 0
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(-CHECK_MAX_LATITUDE, CHECK_MAX_LATITUDE, 40)
+    lons = rng.uniform(-180.0, 180.0, 40)
+    start = datetime.date(args.year, 1, 1)
+    dates = [start + datetime.timedelta(days=d) for d in range(0, 366, 7)]
+    worst = cross_check(lats, lons, dates)
+    print(f"max |kernel - astral|   = {worst['astral']:.3f} s (tolerance {ASTRAL_TOLERANCE_S} s)")
+    print(f"max |kernel - swisseph| = {worst['swisseph']:.3f} s (tolerance {SWISSEPH_TOLERANCE_S} s)")
+    print(f"events astral could not return: {worst['astral_missing']}")
+    # around the dateline, including Samoa's 2011 switch to UTC+13
+    civil_dates = dates + [datetime.date(2011, 12, d) for d in (27, 28, 29, 31)]  # 12-30 was skipped
+    civil_worst, wrong_date = civil_date_check(civil_dates)
+    print(f"dateline zones: max |kernel - astral| = {civil_worst:.3f} s, "
+          f"sunrises on the wrong local date: {wrong_date}")
+    ok = (worst["astral"] <= ASTRAL_TOLERANCE_S and worst["swisseph"] <= SWISSEPH_TOLERANCE_S
+          and civil_worst <= ASTRAL_TOLERANCE_S and wrong_date == 0)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# compute_chart input forms and the sidereal shift against swisseph's own FLG_SIDEREAL.
+import datetime
+
+import numpy as np
+import pytest
+import pytz
+import swisseph as swe
+
+from chart import GRAHAS, compute_chart
+
+CHENNAI = (13.0827, 80.2707)
+IST = pytz.timezone("Asia/Kolkata")
+NAIVE = datetime.datetime(2024, 4, 14, 6, 30)
+JD = swe.julday(2024, 4, 14, 1.0)  # 06:30 IST
+
+def test_julian_day_and_datetimes_agree():
+    by_jd = compute_chart(*CHENNAI, JD)
+    aware = compute_chart(*CHENNAI, IST.localize(NAIVE))
+    naive = compute_chart(*CHENNAI, NAIVE, tz=IST)
+    for chart in (aware, naive):
+        assert chart.jd_ut == pytest.approx(by_jd.jd_ut, abs=1e-9)
+        np.testing.assert_allclose(chart.longitudes, by_jd.longitudes, atol=1e-9)
+        assert chart.ascendant == pytest.approx(by_jd.ascendant, abs=1e-9)
+
+def test_naive_datetime_without_tz():
+    with pytest.raises(ValueError, match="naive datetime requires tz"):
+        compute_chart(*CHENNAI, NAIVE)
+
+@pytest.mark.parametrize("ayanamsa, mode", [("lahiri", swe.SIDM_LAHIRI), ("raman", swe.SIDM_RAMAN)])
+def test_sidereal_matches_flg_sidereal(ayanamsa, mode):
+    chart = compute_chart(*CHENNAI, JD, ayanamsa=ayanamsa)
+    bodies = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE]
+    swe.set_sid_mode(mode)
+    try:
+        expected = [swe.calc_ut(JD, body, swe.FLG_SIDEREAL)[0][0] for body in bodies]
+    finally:
+        swe.set_sid_mode(swe.SIDM_FAGAN_BRADLEY)
+    for name, lon in zip(GRAHAS, expected):
+        assert abs((chart.graha(name) - lon + 180.0) % 360.0 - 180.0) < 1e-6, name
@@ -0,0 +1,21 @@
+# Build a short ephemeris cache and check it against swisseph at random instants.
+import ephemeris_cache
+from ephemeris_cache import EphemerisCache, TOLERANCE_DEG, build_cache
+
+def test_cache_within_tolerance(tmp_path):
+    path = str(tmp_path / "ephemeris.cheb")
+    header = build_cache(path, 2024, 2025)
+    cache = EphemerisCache(path)
+    errors = cache.verify(n_samples=3000)
+    assert set(errors) == set(ephemeris_cache.BODIES)
+    for name, err in errors.items():
+        assert err <= TOLERANCE_DEG, f"{name}: {err * 3600:.3f}\""
+        assert header["bodies"][name]["max_error_deg"] <= TOLERANCE_DEG
+
+def test_ketu_opposite_rahu(tmp_path):
+    path = str(tmp_path / "ephemeris.cheb")
+    build_cache(path, 2024, 2024, bodies=["RAHU"])
+    cache = EphemerisCache(path)
+    jd = cache.jd_start + 100.25
+    diff = (cache.longitude("KETU", jd) - cache.longitude("RAHU", jd)) % 360.0
+    assert abs(diff - 180.0) < 1e-9
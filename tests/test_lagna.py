@@ -0,0 +1,32 @@
+# Lagna timetables against swe.houses' ascendant, including a place inside the arctic circle.
+import datetime
+
+import pytest
+import swisseph as swe
+
+import lagna
+
+PLACES = [(13.08, 80.27), (51.51, -0.13), (-35.28, 149.13), (70.0, 25.0)]
+
+def _asc(jd, lat, lon):
+    return swe.houses_ex(jd, lat, lon, b'E')[1][0]
+
+@pytest.mark.parametrize("lat, lon", PLACES)
+def test_signs_match_swe_houses(lat, lon):
+    dates = [datetime.date(2025, 1, 10) + datetime.timedelta(days=d) for d in range(3)]
+    dates += [datetime.date(2025, 6, 20)]  # polar day at 70 N
+    for rows in lagna.lagna_timetables(lat, lon, dates, "UTC"):
+        assert rows
+        for row in rows:
+            mid = (row.start_jd + row.end_jd) / 2.0
+            assert int(_asc(mid, lat, lon) // 30.0) + 1 == row.sign_no
+        if abs(lat) < lagna.POLAR_LATITUDE:
+            for row in rows[1:]:
+                # one second after the ingress the ascendant is in the new sign, one before it is not
+                assert int(_asc(row.start_jd + 1.0 / 86400.0, lat, lon) // 30.0) + 1 == row.sign_no
+                assert int(_asc(row.start_jd - 1.0 / 86400.0, lat, lon) // 30.0) + 1 != row.sign_no
+
+def test_check_within_tolerance():
+    res = lagna.check(n_places=5, n_days=3)
+    assert res["sign_mismatches"] == 0
+    assert res["boundary_s"] <= lagna.CHECK_TOLERANCE_S
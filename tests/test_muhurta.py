@@ -0,0 +1,30 @@
+# A muhurta table over a few months, queried through its bitmap index and by a plain scan.
+import datetime
+
+import numpy as np
+
+import muhurta
+from panchang_batch import NAKSHATRA, compute_panchang_range
+
+CHENNAI = (13.0827, 80.2707, "Chennai")
+START, END = datetime.date(2025, 1, 1), datetime.date(2025, 3, 31)
+
+def test_query_matches_scan(tmp_path):
+    table = muhurta.build_table(str(tmp_path / "chennai.muhurta"), CHENNAI, START, END)
+    wanted = ["Rohini", "Hasta", "Revati"]
+    matches = table.query(moon_nakshatra=wanted, moon_deg_in_sign=(0.0, 20.0),
+                          start=datetime.date(2025, 1, 15), end=END)
+
+    cols = compute_panchang_range(CHENNAI, START, END)
+    codes = [list(NAKSHATRA).index(name) + 1 for name in wanted]
+    days = [START + datetime.timedelta(days=i) for i in range(len(cols["date"]))]
+    expected = [d for i, d in enumerate(days)
+                if d >= datetime.date(2025, 1, 15) and cols["moon_nakshatra_no"][i] in codes
+                and 0.0 <= cols["moon_deg_in_sign"][i] <= 20.0]
+
+    assert expected
+    assert [m.date for m in matches] == expected
+    for m in matches:
+        i = (m.date - START).days
+        assert abs(m.sunrise.timestamp() - (cols["jd_ut"][i] - 2440587.5) * 86400.0) < 1e-3
+    assert np.all(table.column("moon_nakshatra")[:-1] == cols["moon_nakshatra_no"])
@@ -0,0 +1,35 @@
+# CSV resume: a checkpoint pointing past the end of the output file must not pad it.
+import pandas as pd
+
+from panchang_cli import Checkpoint, CsvSink
+
+def _write_chunk(csv_path, ckpt_path, task_id):
+    checkpoint = Checkpoint(ckpt_path)
+    sink = CsvSink(csv_path, checkpoint)
+    checkpoint.record(task_id, sink.write(pd.DataFrame({"row": [1, 2], "place": ["a", "b"]})))
+    sink.close()
+    checkpoint.close()
+
+def test_resume_after_csv_deleted(tmp_path):
+    csv_path, ckpt_path = str(tmp_path / "out.csv"), str(tmp_path / "out.csv.checkpoint.jsonl")
+    _write_chunk(csv_path, ckpt_path, "p0:0")
+    (tmp_path / "out.csv").unlink()
+
+    checkpoint = Checkpoint(ckpt_path)
+    sink = CsvSink(csv_path, checkpoint)
+    assert checkpoint.done == {}
+    sink.close()
+    checkpoint.close()
+    _write_chunk(csv_path, ckpt_path, "p0:0")
+
+    data = (tmp_path / "out.csv").read_bytes()
+    assert b"\0" not in data
+    assert data.splitlines()[0] == b"row,place"
+    assert len(pd.read_csv(csv_path)) == 2
+
+def test_resume_appends(tmp_path):
+    csv_path, ckpt_path = str(tmp_path / "out.csv"), str(tmp_path / "out.csv.checkpoint.jsonl")
+    _write_chunk(csv_path, ckpt_path, "p0:0")
+    _write_chunk(csv_path, ckpt_path, "p0:1")
+    assert len(pd.read_csv(csv_path)) == 4
+    assert set(Checkpoint(ckpt_path).done) == {"p0:0", "p0:1"}
@@ -0,0 +1,22 @@
+# Cached answers of the timezone resolver against direct polygon lookups.
+from timezonefinder import TimezoneFinder
+from tz_resolver import TimezoneResolver
+
+def test_antimeridian():
+    # the last cell west of 180 samples its east edge at lon 180.0, not 180.05
+    resolver = TimezoneResolver()
+    assert resolver.timezone_name(-16.83, 179.97) == "Pacific/Fiji"
+    assert resolver.timezone_name(-16.83, 180.0) == "Pacific/Fiji"
+
+def test_cell_and_point_keys_do_not_collide():
+    # (0.33, 6.73) falls in cell (6, 134); a cached point at (6.0, 134.0) must not answer for it
+    resolver = TimezoneResolver()
+    resolver.timezone_name(6.0, 134.0)
+    assert resolver.timezone_name(0.33, 6.73) == "Africa/Sao_Tome"
+
+def test_matches_exact_lookup():
+    resolver = TimezoneResolver()
+    finder = TimezoneFinder()
+    for lat, lon in [(13.08, 80.27), (51.5, -0.13), (-33.87, 151.21), (40.71, -74.01), (1.35, 103.82)]:
+        assert resolver.timezone_name(lat, lon) == finder.timezone_at(lng=lon, lat=lat)
+        assert resolver.timezone_name(lat, lon) == finder.timezone_at(lng=lon, lat=lat)  # cached
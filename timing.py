@@ -0,0 +1,159 @@
+# timing.py
+# Per-stage timing for the request pipeline (geocode, timezone, sunrise, houses,
+# calc_ut, ...).
+#
+#   with timing.stage("houses"):
+#       cusps, ascmc = swe.houses(...)
+#
+# Off by default: stage() then returns a shared no-op context manager, so an
+# instrumented call costs one function call and a flag check. Enable with
+# PANCHANG_TIMING=1 in the environment or timing.enable(). When enabled, every
+# stage is
+#   - added to process-wide counters (count, total, max, histogram), exported by
+#     prometheus_text() and snapshot() (JSON-ready);
+#   - logged at DEBUG on the "panchang.timing" logger;
+#   - appended to the current trace(), if one is open on this thread, which gives a
+#     per-request breakdown (used by the Streamlit "Raw data" section).
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("panchang.timing")
+
+# histogram bucket upper bounds, seconds
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_enabled = os.environ.get("PANCHANG_TIMING", "0") not in ("", "0")
+_lock = threading.Lock()
+_stats = {}  # stage -> [count, total, max, bucket counts...]
+_local = threading.local()
+
+def enabled():
+    return _enabled
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+def disable():
+    enable(False)
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP = _NoopStage()
+
+class _Stage:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.t0)
+        return False
+
+def stage(name):
+    """Context manager timing one pipeline stage (a no-op unless enabled)."""
+    if not _enabled:
+        return _NOOP
+    return _Stage(name)
+
+def record(name, seconds):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = [0, 0.0, 0.0] + [0] * len(BUCKETS)
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+        i = bisect.bisect_left(BUCKETS, seconds)
+        if i < len(BUCKETS):
+            entry[3 + i] += 1
+    spans = getattr(_local, "spans", None)
+    if spans is not None:
+        spans.append((name, seconds))
+    logger.debug("%s took %.3f ms", name, seconds * 1000.0)
+
+@contextmanager
+def trace():
+    """Collect the (stage, seconds) spans recorded on this thread inside the block.
+
+    Yields a list that is filled in as stages finish; nested traces each see their
+    own spans and pass them on to the enclosing one.
+    """
+    outer = getattr(_local, "spans", None)
+    spans = []
+    _local.spans = spans
+    try:
+        yield spans
+    finally:
+        _local.spans = outer
+        if outer is not None:
+            outer.extend(spans)
+
+def breakdown(spans):
+    # [(stage, seconds)] -> {stage: total ms}, in first-seen order
+    out = {}
+    for name, seconds in spans:
+        out[name] = out.get(name, 0.0) + seconds * 1000.0
+    return out
+
+# ----------------------------
+# Export
+# ----------------------------
+def snapshot():
+    """JSON-ready per-stage counters: count, total_s, mean_s, max_s."""
+    with _lock:
+        items = [(name, list(entry)) for name, entry in _stats.items()]
+    return {
+        name: {
+            "count": entry[0],
+            "total_s": entry[1],
+            "mean_s": entry[1] / entry[0] if entry[0] else 0.0,
+            "max_s": entry[2],
+        }
+        for name, entry in items
+    }
+
+def prometheus_text(prefix="panchang_stage"):
+    """Counters in the Prometheus text exposition format (a histogram per stage)."""
+    with _lock:
+        items = sorted((name, list(entry)) for name, entry in _stats.items())
+    lines = [
+        f"# HELP {prefix}_seconds Time spent in each pipeline stage.",
+        f"# TYPE {prefix}_seconds histogram",
+    ]
+    for name, entry in items:
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        cumulative = 0
+        for bound, n in zip(BUCKETS, entry[3:]):
+            cumulative += n
+            lines.append(f'{prefix}_seconds_bucket{{stage="{label}",le="{bound:g}"}} {cumulative}')
+        lines.append(f'{prefix}_seconds_bucket{{stage="{label}",le="+Inf"}} {entry[0]}')
+        lines.append(f'{prefix}_seconds_sum{{stage="{label}"}} {entry[1]:.9f}')
+        lines.append(f'{prefix}_seconds_count{{stage="{label}"}} {entry[0]}')
+    lines.append(f"# HELP {prefix}_max_seconds Slowest single call per stage since start.")
+    lines.append(f"# TYPE {prefix}_max_seconds gauge")
+    for name, entry in items:
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{prefix}_max_seconds{{stage="{label}"}} {entry[2]:.9f}')
+    return "\n".join(lines) + "\n"
+
+def reset():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,137 @@
+# tz_resolver.py
+# One process-wide timezone lookup service.
+#
+# TimezoneFinder() reloads its polygon data every time it is constructed, which
+# used to happen on every request. Here it is created once, and answers are kept in
+# a bounded LRU cache keyed on a quantized lat/lon grid cell. A cell whose first
+# point and 3 x 3 sample grid (corners, edge midpoints, centre) all fall in the
+# same zone is treated as interior and answered from the cache; cells that
+# straddle a zone border fall back to an exact polygon lookup per point (also
+# cached, at full precision). Sampling can still miss a border that cuts only a
+# corner between samples or an enclave smaller than half a cell (~2.5 km); points
+# there get the cell's zone.
+import threading
+from collections import OrderedDict
+import numpy as np
+import pytz
+from timezonefinder import TimezoneFinder
+
+DEFAULT_CELL_DEG = 0.05  # ~5 km; cities snap to a handful of cells
+DEFAULT_MAX_ENTRIES = 65536
+
+_BORDER = object()  # cache marker: cell straddles a zone border, look up exact points
+
+class TimezoneResolver:
+    def __init__(self, cell_deg=DEFAULT_CELL_DEG, max_entries=DEFAULT_MAX_ENTRIES, in_memory=False):
+        self.cell_deg = cell_deg
+        self.max_entries = max_entries
+        self._in_memory = in_memory
+        self._finder = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.border_lookups = 0
+
+    def _tf(self):
+        # polygon data is loaded on first use, not at import time
+        if self._finder is None:
+            self._finder = TimezoneFinder(in_memory=self._in_memory)
+        return self._finder
+
+    def _exact(self, lat, lon):
+        return self._tf().timezone_at(lng=lon, lat=lat) or "UTC"
+
+    def _cache_get(self, key):
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key, value):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    # cell and point keys are tagged: (6, 134) == (6.0, 134.0) would otherwise collide
+    def _cell(self, lat, lon):
+        return ("cell", int(np.floor(lat / self.cell_deg)), int(np.floor(lon / self.cell_deg)))
+
+    def _classify_cell(self, cell, lat, lon):
+        # zone of the cell if the point and the 3 x 3 samples agree, else _BORDER
+        tz_str = self._exact(lat, lon)
+        lat0, lon0 = cell[1] * self.cell_deg, cell[2] * self.cell_deg
+        steps = (0.0, self.cell_deg / 2.0, self.cell_deg)
+        for dlat in steps:
+            for dlon in steps:
+                if self._exact(min(lat0 + dlat, 90.0), min(lon0 + dlon, 180.0)) != tz_str:
+                    return _BORDER, tz_str
+        return tz_str, tz_str
+
+    def timezone_name(self, lat, lon):
+        """IANA zone name at (lat, lon); "UTC" where no zone is found."""
+        lat = round(lat, 6)
+        lon = round(lon, 6)
+        cell = self._cell(lat, lon)
+        with self._lock:
+            entry = self._cache_get(cell)
+            if entry is not None and entry is not _BORDER:
+                self.hits += 1
+                return entry
+            if entry is _BORDER:
+                point_tz = self._cache_get(("pt", lat, lon))
+                if point_tz is not None:
+                    self.hits += 1
+                    return point_tz
+                self.misses += 1
+                self.border_lookups += 1
+                tz_str = self._exact(lat, lon)
+                self._cache_put(("pt", lat, lon), tz_str)
+                return tz_str
+            self.misses += 1
+            entry, tz_str = self._classify_cell(cell, lat, lon)
+            self._cache_put(cell, entry)
+            if entry is _BORDER:
+                self.border_lookups += 1
+                self._cache_put(("pt", lat, lon), tz_str)
+            return tz_str
+
+    def timezone(self, lat, lon):
+        # (name, pytz tzinfo) -- the pair fetch_sunrise_and_positions needs
+        tz_str = self.timezone_name(lat, lon)
+        return tz_str, pytz.timezone(tz_str)
+
+    def timezone_names(self, lats, lons):
+        """Vector version of timezone_name: one lookup per distinct rounded point."""
+        points = np.round(np.column_stack([np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)]), 6)
+        unique_points, inverse = np.unique(points, axis=0, return_inverse=True)
+        names = np.array([self.timezone_name(lat, lon) for lat, lon in unique_points], dtype=object)
+        return names[np.asarray(inverse).reshape(-1)]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "border_lookups": self.border_lookups,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._cache),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = self.border_lookups = 0
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+def get_timezone_resolver():
+    # created once per process (each worker of a process pool gets its own)
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = TimezoneResolver()
+    return _resolver
@@ -1,57 +1,15 @@
 import streamlit as st
-import pandas as pd
+import reference_data
 
-# Astrology data (Rasi details)
-data_rasi = {
-    "ராசி": ["மேஷம் (Aries)", "ரிஷபம் (Taurus)", "மிதுனம் (Gemini)", "கடகம் (Cancer)", 
-             "சிம்மம் (Leo)", "கன்னி (Virgo)", "துலாம் (Libra)", "விருச்சிகம் (Scorpio)", 
-             "தனுசு (Sagittarius)", "மகரம் (Capricorn)", "கும்பம் (Aquarius)", "மீனம் (Pisces)"],
-    "அதிபதி": ["செவ்வாய்", "சுக்கிரன்", "புதன்", "சந்திரன்", "சூரியன்", "புதன்", 
-             "சுக்கிரன்", "செவ்வாய்", "குரு", "சனி", "சனி", "குரு"],
-    "ஆண்/பெண்": ["ஆண்", "பெண்", "ஆண்", "பெண்", "ஆண்", "பெண்", "ஆண்", "பெண்", "ஆண்", "பெண்", "ஆண்", "பெண்"],
-    "திசை": ["கிழக்கு", "தெற்கு", "மேற்கு", "வடக்கு", "கிழக்கு", "தெற்கு", 
-             "மேற்கு", "வடக்கு", "கிழக்கு", "தெற்கு", "மேற்கு", "வடக்கு"],
-    "பஞ்சபூதம்": ["அக்கினி", "பூமி", "வாயு", "நீர்", "அக்கினி", "பூமி", 
-                 "வாயு", "நீர்", "அக்கினி", "பூமி", "வாயு", "நீர்"],
-    "ராசி வகை": ["சரம்", "ஸ்திரம்", "உபயம்", "சரம்", "ஸ்திரம்", "உபயம்", 
-                 "சரம்", "ஸ்திரம்", "உபயம்", "சரம்", "ஸ்திரம்", "உபயம்"],
-    "படை": ["ஒற்றைப் படை", "இரட்டைப் படை", "இரட்டைப் படை", "ஒற்றைப் படை", "ஒற்றைப் படை", 
-            "இரட்டைப் படை", "இரட்டைப் படை", "ஒற்றைப் படை", "ஒற்றைப் படை", 
-            "இரட்டைப் படை", "ஒற்றைப் படை", "இரட்டைப் படை"],
-    "குணம்": ["ரஜசம்", "தாமசம்", "ரஜசம்", "சாத்த்விகம்", "சாத்த்விகம்", 
-             "தாமசம்", "ரஜசம்", "தாமசம்", "சாத்த்விகம்", "தாமசம்", "தாமசம்", "சாத்த்விகம்"],
-    "சின்னம்": ["ஆடு", "எருது", "இரட்டை", "நண்டு", "சிங்கம்", "கன்னி", 
-              "தராசு", "விசிறி", "அம்பு", "முதலை", "குடம்", "மீன்"],
-    "தமிழ் மாதம்": ["சித்திரை", "வைகாசி", "ஆனி", "ஆடி", "ஆவணி", "புரட்டாசி", 
-                   "ஐப்பசி", "கார்த்திகை", "மார்கழி", "தை", "மாசி", "பங்குனி"],
-    "உடல் பாகம்": ["தலை", "முகம்", "கைகள்/தோள்", "மார்பு", "இதயம்", "வயிறு", 
-                 "இடுப்பு", "பாலியல் உறுப்புகள்", "தொடை", "முழங்கை", "கால்", "பாதம்"],
-    "நிறம்": ["சிவப்பு", "வெள்ளை", "பச்சை", "வெள்ளை", "செம்மஞ்சள்", 
-            "பச்சை", "நீலம்", "சிகப்பு/கருப்பு", "மஞ்சள்", "கருப்பு", "நீலம்", "மஞ்சள்/வெள்ளை"]
-}
+# Rasi / lagna details live in reference_data; the DataFrames are built once per
+# process there and reused on every rerun (treat them as read-only).
+df_rasi = reference_data.frame("rasi")
+df_lagna = reference_data.frame("lagna")
+ALL = 0  # selectbox value for "all signs"
 
-# Astrology data (Lagna details)
-data_lagna = {
-    "லக்னம் (Lagna)": ["மேஷம் (Aries)", "ரிஷபம் (Taurus)", "மிதுனம் (Gemini)", "கடகம் (Cancer)",
-                      "சிம்மம் (Leo)", "கன்னி (Virgo)", "துலாம் (Libra)", "விருச்சிகம் (Scorpio)",
-                      "தனுசு (Sagittarius)", "மகரம் (Capricorn)", "கும்பம் (Aquarius)", "மீனம் (Pisces)"],
-    "லக்னாதிபதி (Lagna Lord)": ["செவ்வாய்", "சுக்கிரன்", "புதன்", "சந்திரன்", "சூரியன்", "புதன்",
-                            "சுக்கிரன்", "செவ்வாய்", "குரு", "சனி", "சனி", "குரு"],
-    "பாதகாதிபதி (Badhaka)": ["சனி", "குரு", "செவ்வாய்", "சுக்கிரன்", "சுக்கிரன்", "செவ்வாய்",
-                           "குரு", "சனி", "செவ்வாய்", "சந்திரன்", "சூரியன்", "புதன்"],
-    "ரோகாதிபதி (Roga lord)": ["புதன்", "சுக்கிரன்", "செவ்வாய்", "குரு", "சனி", "சனி",
-                            "குரு", "செவ்வாய்", "சுக்கிரன்", "புதன்", "சந்திரன்", "சூரியன்"],
-    "விரயாதிபதி (Vyaya lord)": ["குரு", "செவ்வாய்", "சுக்கிரன்", "புதன்", "சந்திரன்", "சூரியன்",
-                              "புதன்", "சுக்கிரன்", "செவ்வாய்", "குரு", "குரு", "சனி"],
-    "மரகன் (Maraka lords)": ["சுக்கிரன்", "புதன்", "சனி", "சூரியன், சனி", "புதன்", "சுக்கிரன்",
-                          "செவ்வாய்", "சுக்கிரன்", "சனி", "சூரியன்", "சூரியன்", "சுக்கிரன்"],
-    "வர்குடத்த தசை (Critical Dasa)": ["சுக்கிரன்", "புதன்", "சனி", "சனி", "புதன்", "சுக்கிரன்",
-                                "செவ்வாய்", "சுக்கிரன்", "சனி", "சூரியன்", "சூரியன்", "சுக்கிரன்"]
-}
-
-# Convert to DataFrames
-df_rasi = pd.DataFrame(data_rasi)
-df_lagna = pd.DataFrame(data_lagna)
+def sign_label(df, column):
+    names = df[column]
+    return lambda no: "அனைத்தும்" if no == ALL else names.loc[no]
 
 # Streamlit UI
 st.set_page_config(page_title="Astrology Table", layout="wide")
@@ -62,16 +20,18 @@ tab1, tab2 = st.tabs(["📌 ராசி விவரங்கள்", "🌟 ல
 
 # Rasi Tab
 with tab1:
-    choice = st.selectbox("🔍 ஒரு ராசி மட்டும் பார்க்க விரும்புகிறீர்களா?", ["அனைத்தும்"] + df_rasi["ராசி"].tolist())
-    if choice != "அனைத்தும்":
-        st.dataframe(df_rasi[df_rasi["ராசி"] == choice], use_container_width=True)
+    choice = st.selectbox("🔍 ஒரு ராசி மட்டும் பார்க்க விரும்புகிறீர்களா?", [ALL] + df_rasi.index.tolist(),
+                          format_func=sign_label(df_rasi, "ராசி"))
+    if choice != ALL:
+        st.dataframe(df_rasi.loc[[choice]], use_container_width=True)
     else:
         st.dataframe(df_rasi, use_container_width=True)
 
 # Lagna Tab
 with tab2:
-    choice2 = st.selectbox("🔍 ஒரு லக்னம் மட்டும் பார்க்க விரும்புகிறீர்களா?", ["அனைத்தும்"] + df_lagna["லக்னம் (Lagna)"].tolist())
-    if choice2 != "அனைத்தும்":
-        st.dataframe(df_lagna[df_lagna["லக்னம் (Lagna)"] == choice2], use_container_width=True)
+    choice2 = st.selectbox("🔍 ஒரு லக்னம் மட்டும் பார்க்க விரும்புகிறீர்களா?", [ALL] + df_lagna.index.tolist(),
+                           format_func=sign_label(df_lagna, "லக்னம் (Lagna)"))
+    if choice2 != ALL:
+        st.dataframe(df_lagna.loc[[choice2]], use_container_width=True)
     else:
         st.dataframe(df_lagna, use_container_width=True)